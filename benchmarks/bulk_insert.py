@@ -0,0 +1,72 @@
+import os
+import time
+
+import numpy as np
+from sqlalchemy import Integer, create_engine, insert, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from pgvecto_rs.sqlalchemy import VECTOR, bulk_insert
+
+URL = "postgresql+psycopg://{username}:{password}@{host}:{port}/{db_name}".format(
+    port=os.getenv("DB_PORT", "5432"),
+    host=os.getenv("DB_HOST", "localhost"),
+    username=os.getenv("DB_USER", "postgres"),
+    password=os.getenv("DB_PASS", "mysecretpassword"),
+    db_name=os.getenv("DB_NAME", "postgres"),
+)
+ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+DIMENSION = int(os.getenv("BENCH_DIMENSION", "768"))
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Document(Base):
+    __tablename__ = "bench_bulk_insert"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    embedding: Mapped[np.ndarray] = mapped_column(VECTOR(DIMENSION))
+
+
+def bench(name, func):
+    with Session(engine) as session:
+        session.execute(text("TRUNCATE bench_bulk_insert"))
+        session.commit()
+        start = time.perf_counter()
+        func(session)
+        session.commit()
+        elapsed = time.perf_counter() - start
+    print(f"{name:<24}{ROWS / elapsed:>12.0f} rows/s")
+
+
+def row_by_row(session):
+    for i, e in enumerate(matrix):
+        session.execute(insert(Document).values(id=i, embedding=e))
+
+
+def execute_many(session):
+    session.execute(
+        insert(Document),
+        [{"id": i, "embedding": e} for i, e in enumerate(matrix)],
+    )
+
+
+def copy(session):
+    bulk_insert(session, Document, matrix, columns={"id": range(ROWS)})
+
+
+engine = create_engine(URL)
+with engine.connect() as conn:
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vectors"))
+    conn.execute(text("DROP TABLE IF EXISTS bench_bulk_insert"))
+    conn.commit()
+Base.metadata.create_all(engine)
+matrix = np.random.default_rng(0).random((ROWS, DIMENSION), dtype=np.float32)
+
+try:
+    bench("insert row by row", row_by_row)
+    bench("executemany", execute_many)
+    bench("bulk_insert", copy)
+finally:
+    Base.metadata.drop_all(engine)
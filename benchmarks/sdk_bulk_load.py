@@ -0,0 +1,59 @@
+import os
+import time
+
+import numpy as np
+
+from pgvecto_rs.sdk import PGVectoRs
+from pgvecto_rs.types import Hnsw, IndexOption
+
+URL = "postgresql+psycopg://{username}:{password}@{host}:{port}/{db_name}".format(
+    port=os.getenv("DB_PORT", "5432"),
+    host=os.getenv("DB_HOST", "localhost"),
+    username=os.getenv("DB_USER", "postgres"),
+    password=os.getenv("DB_PASS", "mysecretpassword"),
+    db_name=os.getenv("DB_NAME", "postgres"),
+)
+ROWS = int(os.getenv("BENCH_ROWS", "100000"))
+DIMENSION = int(os.getenv("BENCH_DIMENSION", "768"))
+BATCH = int(os.getenv("BENCH_BATCH", "10000"))
+THREADS = int(os.getenv("BENCH_THREADS", "4"))
+
+
+def bench(name, func):
+    # the rows are loaded into a collection holding an HNSW index, and the
+    # time includes indexing them
+    client.delete_all(truncate=True)
+    index = client.create_index(IndexOption(Hnsw(), threads=THREADS))
+    start = time.perf_counter()
+    func()
+    client.wait_for_index(index, poll_interval=0.1)
+    elapsed = time.perf_counter() - start
+    assert client.row_count(estimate=False) == ROWS
+    client.drop_index(index)
+    print(f"{name:<24}{ROWS / elapsed:>12.0f} rows/s")
+
+
+def incremental():
+    for i in range(0, ROWS, BATCH):
+        client.insert_array(matrix[i : i + BATCH], texts[i : i + BATCH])
+
+
+def bulk_load():
+    with client.bulk_load():
+        incremental()
+
+
+client = PGVectoRs(
+    db_url=URL,
+    collection_name="bench_bulk_load",
+    dimension=DIMENSION,
+    recreate=True,
+)
+matrix = np.random.default_rng(0).random((ROWS, DIMENSION), dtype=np.float32)
+texts = [f"text {i}" for i in range(ROWS)]
+
+try:
+    bench("incremental inserts", incremental)
+    bench("bulk_load", bulk_load)
+finally:
+    client.drop()
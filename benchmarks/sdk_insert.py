@@ -0,0 +1,62 @@
+import os
+import time
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from pgvecto_rs.sdk import PGVectoRs, Record
+
+URL = "postgresql+psycopg://{username}:{password}@{host}:{port}/{db_name}".format(
+    port=os.getenv("DB_PORT", "5432"),
+    host=os.getenv("DB_HOST", "localhost"),
+    username=os.getenv("DB_USER", "postgres"),
+    password=os.getenv("DB_PASS", "mysecretpassword"),
+    db_name=os.getenv("DB_NAME", "postgres"),
+)
+ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+DIMENSION = int(os.getenv("BENCH_DIMENSION", "768"))
+
+
+def bench(name, func):
+    client.delete_all()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    assert client.row_count(estimate=False) == ROWS
+    print(f"{name:<24}{ROWS / elapsed:>12.0f} rows/s")
+
+
+def record_loop():
+    # the implementation of PGVectoRs.insert before bulk loading
+    with Session(client._engine) as session:
+        for record in records:
+            session.execute(
+                insert(client._table).values(
+                    id=record.id,
+                    text=record.text,
+                    meta=record.meta,
+                    embedding=record.embedding,
+                ),
+            )
+        session.commit()
+
+
+client = PGVectoRs(
+    db_url=URL,
+    collection_name="bench_insert",
+    dimension=DIMENSION,
+    recreate=True,
+)
+matrix = np.random.default_rng(0).random((ROWS, DIMENSION), dtype=np.float32)
+texts = [f"text {i}" for i in range(ROWS)]
+records = [
+    Record.from_text(t, e, {"i": i}) for i, (t, e) in enumerate(zip(texts, matrix))
+]
+
+try:
+    bench("record loop", record_loop)
+    bench("insert", lambda: client.insert(records))
+    bench("insert_array", lambda: client.insert_array(matrix, texts))
+finally:
+    client.drop()
@@ -0,0 +1,66 @@
+import os
+import time
+
+import numpy as np
+from sqlalchemy import Float, select
+from sqlalchemy.orm import Session
+
+from pgvecto_rs.sdk import PGVectoRs, Record
+from pgvecto_rs.sdk.client import table_factory
+
+URL = "postgresql+psycopg://{username}:{password}@{host}:{port}/{db_name}".format(
+    port=os.getenv("DB_PORT", "5432"),
+    host=os.getenv("DB_HOST", "localhost"),
+    username=os.getenv("DB_USER", "postgres"),
+    password=os.getenv("DB_PASS", "mysecretpassword"),
+    db_name=os.getenv("DB_NAME", "postgres"),
+)
+ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+DIMENSION = int(os.getenv("BENCH_DIMENSION", "768"))
+QUERIES = int(os.getenv("BENCH_QUERIES", "200"))
+TOP_K = 100
+
+
+def bench(name, func):
+    func(queries[0])  # warm up
+    wall, cpu = time.perf_counter(), time.process_time()
+    for q in queries:
+        func(q)
+    wall = (time.perf_counter() - wall) / QUERIES
+    cpu = (time.process_time() - cpu) / QUERIES
+    print(f"{name:<24}{wall * 1000:>8.2f} ms/query{cpu * 1000:>8.2f} ms CPU/query")
+
+
+def orm_search(embedding):
+    # the implementation of PGVectoRs.search before the Core select
+    with Session(client._engine) as session:
+        stmt = (
+            select(
+                orm,
+                orm.embedding.op("<->", return_type=Float)(embedding).label("distance"),
+            )
+            .limit(TOP_K)
+            .order_by("distance")
+        )
+        return [(Record.from_orm(row[0]), row[1]) for row in session.execute(stmt)]
+
+
+client = PGVectoRs(
+    db_url=URL,
+    collection_name="bench_search",
+    dimension=DIMENSION,
+    recreate=True,
+)
+orm = table_factory("bench_search", DIMENSION, {"extend_existing": True})
+rng = np.random.default_rng(0)
+client.insert_array(
+    rng.random((ROWS, DIMENSION), dtype=np.float32),
+    [f"text {i}" for i in range(ROWS)],
+)
+queries = rng.random((QUERIES, DIMENSION), dtype=np.float32)
+
+try:
+    bench("ORM entity", orm_search)
+    bench("search", lambda q: client.search(q, top_k=TOP_K))
+finally:
+    client.drop()
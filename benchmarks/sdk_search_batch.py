@@ -0,0 +1,50 @@
+import os
+import time
+
+import numpy as np
+
+from pgvecto_rs.sdk import PGVectoRs
+
+URL = "postgresql+psycopg://{username}:{password}@{host}:{port}/{db_name}".format(
+    port=os.getenv("DB_PORT", "5432"),
+    host=os.getenv("DB_HOST", "localhost"),
+    username=os.getenv("DB_USER", "postgres"),
+    password=os.getenv("DB_PASS", "mysecretpassword"),
+    db_name=os.getenv("DB_NAME", "postgres"),
+)
+ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+DIMENSION = int(os.getenv("BENCH_DIMENSION", "768"))
+QUERIES = int(os.getenv("BENCH_QUERIES", "64"))
+TOP_K = 10
+REPEAT = 5
+
+
+def bench(name, func):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    elapsed = (time.perf_counter() - start) / REPEAT
+    print(f"{name:<24}{elapsed * 1000:>10.1f} ms / {QUERIES} queries")
+
+
+def search_loop():
+    return [client.search(q, top_k=TOP_K) for q in queries]
+
+
+client = PGVectoRs(
+    db_url=URL,
+    collection_name="bench_search_batch",
+    dimension=DIMENSION,
+    recreate=True,
+)
+rng = np.random.default_rng(0)
+matrix = rng.random((ROWS, DIMENSION), dtype=np.float32)
+queries = rng.random((QUERIES, DIMENSION), dtype=np.float32)
+client.insert_array(matrix, [f"text {i}" for i in range(ROWS)])
+
+try:
+    bench("search loop", search_loop)
+    bench("search_batch", lambda: client.search_batch(queries, top_k=TOP_K))
+finally:
+    client.drop()
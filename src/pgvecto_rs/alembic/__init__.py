@@ -0,0 +1,3 @@
+from .operations import CreateVectorIndexOp, DropVectorIndexOp
+
+__all__ = ["CreateVectorIndexOp", "DropVectorIndexOp"]
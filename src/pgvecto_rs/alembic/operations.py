@@ -0,0 +1,136 @@
+from typing import Optional, Union
+
+from alembic.operations import MigrateOperation, Operations
+from sqlalchemy import Column, MetaData, Table
+
+from pgvecto_rs.sqlalchemy.index import VectorIndex
+from pgvecto_rs.types import Flat, Hnsw, IndexOption, Ivf
+
+
+@Operations.register_operation("create_vector_index")
+class CreateVectorIndexOp(MigrateOperation):
+    """Create a `vectors` index, e.g. in a migration:
+
+    op.create_vector_index("emb_idx", "items", "embedding", Hnsw(), concurrently=True)
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        index_name: str,
+        table_name: str,
+        column_name: str,
+        option: Union[IndexOption, Hnsw, Ivf, Flat],
+        opclass: str = "vector_l2_ops",
+        schema: Optional[str] = None,
+        concurrently: bool = False,
+    ):
+        self.index_name = index_name
+        self.table_name = table_name
+        self.column_name = column_name
+        self.option = option
+        self.opclass = opclass
+        self.schema = schema
+        self.concurrently = concurrently
+
+    @classmethod
+    def create_vector_index(  # noqa: PLR0913
+        cls,
+        operations: Operations,
+        index_name: str,
+        table_name: str,
+        column_name: str,
+        option: Union[IndexOption, Hnsw, Ivf, Flat],
+        opclass: str = "vector_l2_ops",
+        schema: Optional[str] = None,
+        concurrently: bool = False,
+    ):
+        op = cls(
+            index_name,
+            table_name,
+            column_name,
+            option,
+            opclass=opclass,
+            schema=schema,
+            concurrently=concurrently,
+        )
+        return operations.invoke(op)
+
+    def to_index(self) -> VectorIndex:
+        table = Table(
+            self.table_name, MetaData(), Column(self.column_name), schema=self.schema
+        )
+        return VectorIndex(
+            self.index_name,
+            table.c[self.column_name],
+            self.option,
+            opclass=self.opclass,
+            concurrently=self.concurrently,
+        )
+
+    def reverse(self):
+        return DropVectorIndexOp(
+            self.index_name,
+            self.table_name,
+            schema=self.schema,
+            concurrently=self.concurrently,
+            _reverse=self,
+        )
+
+
+@Operations.register_operation("drop_vector_index")
+class DropVectorIndexOp(MigrateOperation):
+    """Drop a `vectors` index, optionally with `DROP INDEX CONCURRENTLY`."""
+
+    def __init__(
+        self,
+        index_name: str,
+        table_name: Optional[str] = None,
+        schema: Optional[str] = None,
+        concurrently: bool = False,
+        _reverse: Optional[CreateVectorIndexOp] = None,
+    ):
+        self.index_name = index_name
+        self.table_name = table_name
+        self.schema = schema
+        self.concurrently = concurrently
+        self._reverse = _reverse
+
+    @classmethod
+    def drop_vector_index(  # noqa: PLR0913
+        cls,
+        operations: Operations,
+        index_name: str,
+        table_name: Optional[str] = None,
+        schema: Optional[str] = None,
+        concurrently: bool = False,
+    ):
+        op = cls(index_name, table_name, schema=schema, concurrently=concurrently)
+        return operations.invoke(op)
+
+    def reverse(self):
+        return self._reverse
+
+
+@Operations.implementation_for(CreateVectorIndexOp)
+def create_vector_index(operations: Operations, operation: CreateVectorIndexOp):
+    index = operation.to_index()
+    if operation.concurrently:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with operations.get_context().autocommit_block():
+            operations.impl.create_index(index)
+    else:
+        operations.impl.create_index(index)
+
+
+@Operations.implementation_for(DropVectorIndexOp)
+def drop_vector_index(operations: Operations, operation: DropVectorIndexOp):
+    kwargs = {
+        "table_name": operation.table_name,
+        "schema": operation.schema,
+        "postgresql_concurrently": operation.concurrently,
+    }
+    if operation.concurrently:
+        with operations.get_context().autocommit_block():
+            operations.drop_index(operation.index_name, **kwargs)
+    else:
+        operations.drop_index(operation.index_name, **kwargs)
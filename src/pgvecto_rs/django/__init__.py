@@ -2,6 +2,7 @@ from .bvector import BinaryVectorField
 from .extensions import VectorExtension
 from .functions import CosineDistance, JaccardDistance, L2Distance, MaxInnerProduct
 from .indexes import FlatIndex, HnswIndex, IvfIndex
+from .search import search_option
 from .svector import SparseVectorField
 from .vecf16 import Float16VectorField
 from .vector import VectorField
@@ -19,4 +20,5 @@ __all__ = [
     "MaxInnerProduct",
     "CosineDistance",
     "JaccardDistance",
+    "search_option",
 ]
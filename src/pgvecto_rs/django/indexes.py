@@ -1,25 +1,53 @@
-from typing import Optional
+from typing import Optional, Union
 
 from django.contrib.postgres.indexes import PostgresIndex
 
-from pgvecto_rs.types import Flat, Hnsw, IndexOption, Ivf, Quantization
+from pgvecto_rs.types import (
+    Flat,
+    Hnsw,
+    IndexOption,
+    Ivf,
+    Optimizing,
+    Quantization,
+    Segment,
+)
 from pgvecto_rs.types.index import QuantizationRatio, QuantizationType
 
+_SEGMENT_OPTIONS = ("max_growing_segment_size", "max_sealed_segment_size")
+_OPTIMIZING_OPTIONS = ("sealing_secs", "sealing_size", "delete_threshold")
+
 
 class IndexBase(PostgresIndex):
+    """Base of the `vectors` indexes. Besides `threads` and the quantization,
+    the segment and optimizing settings of `Segment` and `Optimizing` are
+    accepted as keyword arguments, e.g. `max_growing_segment_size`.
+    """
+
     suffix = "vectors"
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *expressions,
         threads: Optional[int] = None,
         quantization_type: Optional[QuantizationType] = None,
         quantization_ratio: Optional[QuantizationRatio] = None,
+        max_growing_segment_size: Optional[int] = None,
+        max_sealed_segment_size: Optional[int] = None,
+        sealing_secs: Optional[int] = None,
+        sealing_size: Optional[int] = None,
+        delete_threshold: Optional[float] = None,
         **kwargs,
     ):
         self.threads = threads
         self.quantization_type = quantization_type
         self.quantization_ratio = quantization_ratio
+        self.max_growing_segment_size = max_growing_segment_size
+        self.max_sealed_segment_size = max_sealed_segment_size
+        self.sealing_secs = sealing_secs
+        self.sealing_size = sealing_size
+        self.delete_threshold = delete_threshold
+        # validate the options when the model is loaded
+        self.get_option(Flat())
         super().__init__(*expressions, **kwargs)
 
     def deconstruct(self):
@@ -27,8 +55,26 @@ class IndexBase(PostgresIndex):
         kwargs["threads"] = self.threads
         kwargs["quantization_type"] = self.quantization_type
         kwargs["quantization_ratio"] = self.quantization_ratio
+        for key in (*_SEGMENT_OPTIONS, *_OPTIMIZING_OPTIONS):
+            if getattr(self, key) is not None:
+                kwargs[key] = getattr(self, key)
         return path, args, kwargs
 
+    def get_quantization(self) -> Optional[Quantization]:
+        if not self.quantization_type:
+            return None
+        return Quantization(typ=self.quantization_type, ratio=self.quantization_ratio)
+
+    def get_option(self, index: Union[Hnsw, Ivf, Flat]) -> IndexOption:
+        return IndexOption(
+            index=index,
+            threads=self.threads,
+            segment=Segment(*[getattr(self, key) for key in _SEGMENT_OPTIONS]),
+            optimizing=Optimizing(
+                self.threads, *[getattr(self, key) for key in _OPTIMIZING_OPTIONS]
+            ),
+        )
+
 
 class HnswIndex(IndexBase):
     def __init__(  # noqa: PLR0913
@@ -58,31 +104,35 @@ class HnswIndex(IndexBase):
         return path, args, kwargs
 
     def get_with_params(self):
-        quant = (
-            Quantization(typ=self.quantization_type, ratio=self.quantization_ratio)
-            if self.quantization_type
-            else None
-        )
-        option = IndexOption(
-            index=Hnsw(
-                m=self.m, ef_construction=self.ef_construction, quantization=quant
-            ),
-            threads=self.threads,
+        option = self.get_option(
+            Hnsw(
+                m=self.m,
+                ef_construction=self.ef_construction,
+                quantization=self.get_quantization(),
+            )
         )
         return [f"options = $${option.dumps()}$$"]
 
 
 class IvfIndex(IndexBase):
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *expressions,
         nlist: Optional[int] = None,
+        nsample: Optional[int] = None,
+        least_iterations: Optional[int] = None,
+        iterations: Optional[int] = None,
         threads: Optional[int] = None,
         quantization_type: Optional[QuantizationType] = None,
         quantization_ratio: Optional[QuantizationRatio] = None,
         **kwargs,
     ):
         self.nlist = nlist
+        self.nsample = nsample
+        self.least_iterations = least_iterations
+        self.iterations = iterations
+        # validate the training options when the model is loaded
+        Ivf(nsample=nsample, least_iterations=least_iterations, iterations=iterations)
         super().__init__(
             *expressions,
             threads=threads,
@@ -94,17 +144,20 @@ class IvfIndex(IndexBase):
     def deconstruct(self):
         path, args, kwargs = super().deconstruct()
         kwargs["nlist"] = self.nlist
+        for key in ("nsample", "least_iterations", "iterations"):
+            if getattr(self, key) is not None:
+                kwargs[key] = getattr(self, key)
         return path, args, kwargs
 
     def get_with_params(self):
-        quant = (
-            Quantization(typ=self.quantization_type, ratio=self.quantization_ratio)
-            if self.quantization_type
-            else None
-        )
-        option = IndexOption(
-            index=Ivf(nlist=self.nlist, quantization=quant),
-            threads=self.threads,
+        option = self.get_option(
+            Ivf(
+                nlist=self.nlist,
+                quantization=self.get_quantization(),
+                nsample=self.nsample,
+                least_iterations=self.least_iterations,
+                iterations=self.iterations,
+            )
         )
         return [f"options = $${option.dumps()}$$"]
 
@@ -131,13 +184,5 @@ class FlatIndex(IndexBase):
         return path, args, kwargs
 
     def get_with_params(self):
-        quant = (
-            Quantization(typ=self.quantization_type, ratio=self.quantization_ratio)
-            if self.quantization_type
-            else None
-        )
-        option = IndexOption(
-            index=Flat(quantization=quant),
-            threads=self.threads,
-        )
+        option = self.get_option(Flat(quantization=self.get_quantization()))
         return [f"options = $${option.dumps()}$$"]
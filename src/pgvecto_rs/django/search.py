@@ -0,0 +1,41 @@
+from contextlib import contextmanager, suppress
+from typing import Dict, Optional
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+
+from pgvecto_rs.types import SearchOption
+from pgvecto_rs.types.search import set_config_query
+
+
+@contextmanager
+def search_option(option: SearchOption, using: Optional[str] = None):
+    """Run the block in an atomic block tuned by `option`.
+
+    The settings are applied in one statement with `set_config(..., true)`, and
+    the values they replace are restored on exit, even if the block raises, so
+    that they don't leak into an enclosing atomic block.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    query = option.set_config_query()
+    with transaction.atomic(using=using):
+        previous = {}
+        if query is not None:
+            with connections[using].cursor() as cursor:
+                cursor.execute(*query)
+                previous = dict(zip(option.dump(), cursor.fetchone()[::2]))
+        try:
+            yield
+        except BaseException:
+            # the block may have aborted the transaction, whose rollback ends
+            # the settings anyway
+            with suppress(DatabaseError):
+                _restore(using, previous)
+            raise
+        _restore(using, previous)
+
+
+def _restore(using: str, previous: Dict[str, Optional[str]]) -> None:
+    query = set_config_query(previous)
+    if query is not None:
+        with connections[using].cursor() as cursor:
+            cursor.execute(*query)
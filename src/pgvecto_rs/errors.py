@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 
 class PGVectoRsError(ValueError):
@@ -72,3 +72,49 @@ class CountRowsEstimateCondError(PGVectoRsError):
         super().__init__(
             "cannot use estimate=True and a condition for row count requests"
         )
+
+
+class MatrixDimensionError(PGVectoRsError):
+    def __init__(self, dim: int) -> None:
+        super().__init__(f"ndarray must be 2D for a batch of vectors, got {dim}D")
+
+
+class BatchLengthError(PGVectoRsError):
+    def __init__(self, column: str, expected: int, actual: int) -> None:
+        super().__init__(
+            f"expected {expected} values for column '{column}', got {actual}"
+        )
+
+
+class OptionValueError(PGVectoRsError):
+    def __init__(self, name: str, value: object, expected: str) -> None:
+        super().__init__(f"invalid value {value!r} for {name}, expected {expected}")
+
+
+class OpclassNotFoundError(PGVectoRsError):
+    def __init__(self, column_type: object, distance_op: str) -> None:
+        super().__init__(
+            f"no vectors operator class for column type {column_type} and distance {distance_op}"
+        )
+
+
+class IndexBuildTimeoutError(PGVectoRsError):
+    def __init__(self, name: str, timeout: float) -> None:
+        super().__init__(f"index {name} is still being built after {timeout}s")
+
+
+class IndexRestoreError(PGVectoRsError):
+    def __init__(self, definitions: List[str]) -> None:
+        self.definitions = definitions
+        super().__init__(
+            "failed to create the vector indexes again, run their definitions: "
+            + "; ".join(definitions)
+        )
+
+
+class VectorIndexUnusedWarning(UserWarning):
+    def __init__(self, table: str) -> None:
+        super().__init__(
+            f"the search on {table} doesn't scan a vector index, check that one "
+            "exists with the operator class of the distance"
+        )
@@ -1,3 +1,19 @@
 from .register import register_vector, register_vector_async
+from .search import (
+    search_option,
+    search_option_async,
+    set_search_option,
+    set_search_option_async,
+)
+from .warmup import warmup, warmup_async
 
-__all__ = ["register_vector", "register_vector_async"]
+__all__ = [
+    "register_vector",
+    "register_vector_async",
+    "search_option",
+    "search_option_async",
+    "set_search_option",
+    "set_search_option_async",
+    "warmup",
+    "warmup_async",
+]
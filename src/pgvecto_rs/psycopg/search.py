@@ -0,0 +1,71 @@
+from contextlib import asynccontextmanager, contextmanager, suppress
+from typing import Optional
+
+from psycopg import AsyncConnection, AsyncCursor, Connection, Cursor, Error
+
+from pgvecto_rs.types import SearchOption
+from pgvecto_rs.types.search import set_config_query
+
+
+def set_search_option(conn: Connection, option: SearchOption) -> None:
+    """Apply the settings of `option` to the current transaction in one statement."""
+    query = option.set_config_query()
+    if query is not None:
+        conn.execute(*query)
+
+
+async def set_search_option_async(conn: AsyncConnection, option: SearchOption):
+    query = option.set_config_query()
+    if query is not None:
+        await conn.execute(*query)
+
+
+@contextmanager
+def search_option(conn: Connection, option: SearchOption):
+    """Run the block in a transaction tuned by `option`.
+
+    The settings are queued in pipeline mode, so they reach the server in the
+    same round trip as the first search of the block. The values they replace
+    are restored on exit, even if the block raises, so that they don't leak
+    into an enclosing transaction.
+    """
+    with conn.pipeline(), conn.transaction():
+        query = option.set_config_query()
+        cur = conn.execute(*query) if query is not None else None
+        try:
+            yield conn
+        except BaseException:
+            # the block may have aborted the transaction, whose rollback ends
+            # the settings anyway
+            with suppress(Error):
+                _restore(conn, option, cur)
+            raise
+        _restore(conn, option, cur)
+
+
+def _restore(conn: Connection, option: SearchOption, cur: Optional[Cursor]) -> None:
+    if cur is not None:
+        previous = dict(zip(option.dump(), cur.fetchone()[::2]))
+        conn.execute(*set_config_query(previous))
+
+
+@asynccontextmanager
+async def search_option_async(conn: AsyncConnection, option: SearchOption):
+    async with conn.pipeline(), conn.transaction():
+        query = option.set_config_query()
+        cur = await conn.execute(*query) if query is not None else None
+        try:
+            yield conn
+        except BaseException:
+            with suppress(Error):
+                await _restore_async(conn, option, cur)
+            raise
+        await _restore_async(conn, option, cur)
+
+
+async def _restore_async(
+    conn: AsyncConnection, option: SearchOption, cur: Optional[AsyncCursor]
+) -> None:
+    if cur is not None:
+        previous = dict(zip(option.dump(), (await cur.fetchone())[::2]))
+        await conn.execute(*set_config_query(previous))
@@ -0,0 +1,85 @@
+import time
+from typing import Tuple
+
+from psycopg import AsyncConnection, Connection, sql
+
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.utils import DISTANCE_OPS, HAS_PREWARM, sample_percent
+
+_PREWARM = "SELECT pg_prewarm(%s::regclass)"
+_ROWS = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+
+
+def _identifier(table: str) -> sql.Identifier:
+    # `schema.table` is qualified, like the `regclass` of the name
+    return sql.Identifier(*table.split("."))
+
+
+def _replay_query(
+    table: sql.Identifier, column: str, distance_op: str, queries: int, top_k: int
+) -> Tuple[sql.Composed, list]:
+    """One statement searching for embeddings sampled from `table`, each
+    joined LATERAL to its KNN search so that the vector index is read.
+    """
+    if distance_op not in DISTANCE_OPS:
+        raise OptionValueError("distance_op", distance_op, f"one of {DISTANCE_OPS}")
+    query = sql.SQL(
+        "SELECT count(*) FROM "
+        "(SELECT {column} AS q FROM {table} TABLESAMPLE SYSTEM (%s) LIMIT %s) AS s, "
+        "LATERAL (SELECT 1 FROM {table} ORDER BY {column} {op} s.q LIMIT %s) AS knn"
+    ).format(
+        table=table,
+        column=sql.Identifier(column),
+        op=sql.SQL(distance_op),
+    )
+    return query, [queries, top_k]
+
+
+def warmup(  # noqa: PLR0913
+    conn: Connection,
+    table: str,
+    column: str = "embedding",
+    distance_op: str = "<->",
+    queries: int = 64,
+    top_k: int = 10,
+) -> float:
+    """Load `table` and its vector index into memory, e.g. before a readiness
+    probe succeeds.
+
+    The table is read into shared buffers with `pg_prewarm` when the extension
+    is installed. The vector index, kept by pgvecto.rs outside of them, is read
+    by searching for `queries` embeddings sampled from the table. `table` may
+    be qualified by its schema, e.g. `schema.table`.
+
+    Returns the seconds it took.
+    """
+    start = time.perf_counter()
+    identifier = _identifier(table)
+    query, params = _replay_query(identifier, column, distance_op, queries, top_k)
+    regclass = identifier.as_string(conn)
+    if conn.execute(HAS_PREWARM).fetchone()[0]:
+        conn.execute(_PREWARM, [regclass])
+    if queries > 0:
+        rows = conn.execute(_ROWS, [regclass]).fetchone()[0]
+        conn.execute(query, [sample_percent(rows, queries), *params])
+    return time.perf_counter() - start
+
+
+async def warmup_async(  # noqa: PLR0913
+    conn: AsyncConnection,
+    table: str,
+    column: str = "embedding",
+    distance_op: str = "<->",
+    queries: int = 64,
+    top_k: int = 10,
+) -> float:
+    start = time.perf_counter()
+    identifier = _identifier(table)
+    query, params = _replay_query(identifier, column, distance_op, queries, top_k)
+    regclass = identifier.as_string(conn)
+    if (await (await conn.execute(HAS_PREWARM)).fetchone())[0]:
+        await conn.execute(_PREWARM, [regclass])
+    if queries > 0:
+        rows = (await (await conn.execute(_ROWS, [regclass])).fetchone())[0]
+        await conn.execute(query, [sample_percent(rows, queries), *params])
+    return time.perf_counter() - start
@@ -1,5 +1,16 @@
+from pgvecto_rs.sdk.async_client import AsyncPGVectoRs
+from pgvecto_rs.sdk.cache import SearchCache
 from pgvecto_rs.sdk.client import PGVectoRs
 from pgvecto_rs.sdk.filters import Filter
 from pgvecto_rs.sdk.record import Record
+from pgvecto_rs.sdk.result import RecordBatch, SearchResult
 
-__all__ = ["PGVectoRs", "Record", "Filter"]
+__all__ = [
+    "AsyncPGVectoRs",
+    "PGVectoRs",
+    "Record",
+    "RecordBatch",
+    "Filter",
+    "SearchCache",
+    "SearchResult",
+]
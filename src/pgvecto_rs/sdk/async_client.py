@@ -0,0 +1,342 @@
+import asyncio
+import functools
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+from uuid import UUID
+
+from numpy import ndarray
+from sqlalchemy import Delete, Table, delete, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from pgvecto_rs.errors import TypeNotFoundError
+from pgvecto_rs.sdk.client import (
+    DistanceOp,
+    VectorType,
+    _delete_stmts,
+    _encode,
+    _fetch_stmt,
+    _group_by_query,
+    _in_order,
+    _insert_columns,
+    _is_missing_schema,
+    _projection,
+    _row_count,
+    _row_count_stmt,
+    _search_batch_stmt,
+    _search_stmt,
+    _upsert_stmts,
+    collection_table,
+)
+from pgvecto_rs.sdk.filters import Filter
+from pgvecto_rs.sdk.record import Record, Unique
+from pgvecto_rs.sdk.result import SearchResult
+from pgvecto_rs.sqlalchemy import bulk_insert, set_search_option
+from pgvecto_rs.types import SearchOption
+from pgvecto_rs.utils import to_numpy
+
+
+def _verify_schema(method):
+    """Async variant of `pgvecto_rs.sdk.client._verify_schema`."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        assume_schema = self._assume_schema
+        try:
+            return await method(self, *args, **kwargs)
+        except (ProgrammingError, TypeNotFoundError) as err:
+            if not assume_schema or not _is_missing_schema(err):
+                raise
+        # concurrent first calls, e.g. with `asyncio.gather`, create it once
+        if self._schema_lock is None:
+            # created in the running loop, which Python < 3.10 binds on creation
+            self._schema_lock: Optional[asyncio.Lock] = None
+        async with self._schema_lock:
+            if self._assume_schema:
+                await self._create_schema()
+        return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncPGVectoRs:
+    """asyncio counterpart of `PGVectoRs`.
+
+    Every call checks out its own connection from the pool of the async engine,
+    so searches issued concurrently, e.g. with `asyncio.gather`, run in parallel.
+    Create it with `await AsyncPGVectoRs.create(...)` and release the pool with
+    `await client.close()`.
+    """
+
+    _engine: AsyncEngine
+    _table: Table
+    dimension: int
+
+    def __init__(  # noqa: PLR0913
+        self,
+        db_url: Union[str, AsyncEngine],
+        collection_name: str,
+        dimension: int,
+        constraints: Union[List[Unique], None] = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        vector_type: VectorType = "vector",
+    ) -> None:
+        """Bind to a table without touching the database, see `create`.
+
+        Args:
+        ----
+            db_url (str | AsyncEngine): url to the database, with an async driver,
+                e.g. `postgresql+psycopg://...` or `postgresql+asyncpg://...`,
+                or an engine shared with other clients.
+            collection_name (str): name of the collection. A prefix `collection_` is added to actual table name.
+            dimension (int): dimension of the embeddings.
+            constraints (List[Unique]): add constraints to columns, e.g. UNIQUE constraint
+            pool_size (int): connections kept open by the pool, unused when `db_url` is an engine.
+            max_overflow (int): connections opened beyond `pool_size` under load.
+            pool_pre_ping (bool): test connections for liveness on checkout.
+            pool_recycle (int): seconds after which a connection is replaced, -1 to never.
+            vector_type (str): type of the embedding column, see `PGVectoRs`.
+        """
+        if isinstance(db_url, AsyncEngine):
+            self._engine = db_url
+        else:
+            self._engine = create_async_engine(
+                db_url,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+            )
+        self._table = collection_table(
+            collection_name, dimension, constraints, vector_type
+        )
+        self.dimension = dimension
+        self._assume_schema = True
+        self._schema_lock = asyncio.Lock()
+
+    @classmethod
+    async def create(  # noqa: PLR0913
+        cls,
+        db_url: Union[str, AsyncEngine],
+        collection_name: str,
+        dimension: int,
+        recreate: bool = False,
+        constraints: Union[List[Unique], None] = None,
+        assume_schema: bool = False,
+        **options,
+    ) -> "AsyncPGVectoRs":
+        """Connect to an existing table or create a new empty one.
+        If the `recreate=True`, the table will be dropped if it exists.
+
+        With `assume_schema=True` no statement is sent, the extension and the
+        table are created on the first statement failing because they are
+        missing. `options`, e.g. `pool_size` or `vector_type`, are passed to
+        `__init__`.
+        """
+        client = cls(db_url, collection_name, dimension, constraints, **options)
+        if recreate or not assume_schema:
+            await client._create_schema(recreate)
+        return client
+
+    async def _create_schema(self, recreate: bool = False) -> None:
+        async with self._engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vectors"))
+            if recreate:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {self._table.name}"))
+            await conn.run_sync(self._table.create, checkfirst=True)
+        self._assume_schema = False
+
+    async def close(self) -> None:
+        """Close all the connections of the pool."""
+        await self._engine.dispose()
+
+    async def insert(self, records: List[Record], batch_size: int = 1000) -> None:
+        """Insert records in one transaction."""
+        if len(records) == 0:
+            return
+        await self.insert_array(
+            [to_numpy(record.embedding) for record in records],
+            [record.text for record in records],
+            [record.meta for record in records],
+            ids=[record.id for record in records],
+            batch_size=batch_size,
+        )
+
+    @_verify_schema
+    async def insert_array(  # noqa: PLR0913
+        self,
+        embeddings: Union[ndarray, Sequence[Sequence[float]]],
+        texts: Sequence[str],
+        metas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[UUID]] = None,
+        batch_size: int = 1000,
+    ) -> List[UUID]:
+        """Insert a 2-D array of embeddings and their texts in one transaction,
+        see `PGVectoRs.insert_array`.
+        """
+        columns = _insert_columns(texts, metas, ids)
+        async with AsyncSession(self._engine) as session:
+            await session.run_sync(
+                bulk_insert,
+                self._table,
+                _encode(self._table, embeddings),
+                columns=columns,
+                batch_size=batch_size,
+            )
+            await session.commit()
+        return columns["id"]
+
+    @_verify_schema
+    async def upsert(
+        self,
+        records: List[Record],
+        on: Optional[Unique] = None,
+        batch_size: int = 1000,
+        skip_unchanged: bool = False,
+    ) -> int:
+        """Insert records, updating the rows they conflict with, see `PGVectoRs.upsert`."""
+        count = 0
+        async with AsyncSession(self._engine) as session:
+            for stmt in _upsert_stmts(
+                self._table, records, on, batch_size, skip_unchanged
+            ):
+                count += (await session.execute(stmt)).rowcount
+            await session.commit()
+        return count
+
+    @_verify_schema
+    async def search(  # noqa: PLR0913
+        self,
+        embedding: Union[ndarray, List[float]],
+        distance_op: DistanceOp = "<->",
+        top_k: int = 4,
+        filter: Optional[Filter] = None,
+        search_option: Optional[SearchOption] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        ids_only: bool = False,
+    ) -> SearchResult:
+        """Search for the nearest records, see `PGVectoRs.search`."""
+        columns = _projection(self._table, include, exclude, ids_only)
+        stmt = _search_stmt(self._table, columns, embedding, distance_op, top_k, filter)
+        async with AsyncSession(self._engine) as session:
+            if search_option is not None:
+                await session.run_sync(set_search_option, search_option)
+            res = await session.execute(stmt)
+            names = [c.name for c in columns]
+            return SearchResult.from_rows(res.all(), names, self.dimension)
+
+    @_verify_schema
+    async def search_batch(  # noqa: PLR0913
+        self,
+        embeddings: Union[ndarray, List[List[float]]],
+        distance_op: DistanceOp = "<->",
+        top_k: int = 4,
+        filter: Optional[Filter] = None,
+        search_option: Optional[SearchOption] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        ids_only: bool = False,
+    ) -> List[SearchResult]:
+        """Search for the nearest records of several embeddings in one statement,
+        see `PGVectoRs.search_batch`.
+        """
+        rows = list(enumerate(embeddings))
+        if not rows:
+            return []
+        columns = _projection(self._table, include, exclude, ids_only)
+        stmt = _search_batch_stmt(
+            self._table, columns, rows, distance_op, top_k, filter
+        )
+        async with AsyncSession(self._engine) as session:
+            if search_option is not None:
+                await session.run_sync(set_search_option, search_option)
+            return _group_by_query(
+                len(rows), await session.execute(stmt), columns, self.dimension
+            )
+
+    @_verify_schema
+    async def fetch(self, ids: List[UUID]) -> List[Record]:
+        """Get the records of `ids`, in the same order, see `PGVectoRs.fetch`."""
+        async with AsyncSession(self._engine) as session:
+            rows = await session.execute(_fetch_stmt(self._table, ids))
+            return _in_order(ids, rows)
+
+    # ================ Stat ==================
+    @_verify_schema
+    async def row_count(
+        self,
+        estimate: bool = True,
+        filter: Optional[Filter] = None,
+        sample: Optional[float] = None,
+    ) -> int:
+        """Count the records, see `PGVectoRs.row_count`."""
+        stmt = _row_count_stmt(self._table, estimate, filter, sample)
+        async with AsyncSession(self._engine) as session:
+            return _row_count((await session.execute(stmt)).scalar_one())
+
+    # ================ Delete ================
+    @_verify_schema
+    async def delete(
+        self,
+        filter: Filter,
+        chunk_size: Optional[int] = None,
+        sleep: float = 0.0,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Delete the records matching `filter`, see `PGVectoRs.delete`."""
+        return await self._delete(
+            *_delete_stmts(self._table, filter, None, chunk_size), sleep, progress
+        )
+
+    @_verify_schema
+    async def delete_all(self, truncate: bool = False) -> None:
+        """Delete all the records, see `PGVectoRs.delete_all`."""
+        async with AsyncSession(self._engine) as session:
+            if truncate:
+                await session.execute(text(f"TRUNCATE TABLE {self._table.name}"))
+            else:
+                await session.execute(delete(self._table))
+            await session.commit()
+
+    @_verify_schema
+    async def delete_by_ids(
+        self,
+        ids: Sequence[UUID],
+        chunk_size: Optional[int] = None,
+        sleep: float = 0.0,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Delete the records of `ids`, see `PGVectoRs.delete_by_ids`."""
+        return await self._delete(
+            *_delete_stmts(self._table, None, ids, chunk_size), sleep, progress
+        )
+
+    async def _delete(
+        self,
+        stmts: Iterable[Delete],
+        chunk_size: Optional[int],
+        sleep: float,
+        progress: Optional[Callable[[int], None]],
+    ) -> int:
+        total = 0
+        async with AsyncSession(self._engine) as session:
+            for i, stmt in enumerate(stmts):
+                if i and sleep:
+                    await asyncio.sleep(sleep)
+                count = (await session.execute(stmt)).rowcount
+                await session.commit()
+                total += count
+                if progress is not None:
+                    progress(total)
+                if chunk_size is not None and count < chunk_size:
+                    break
+        return total
+
+    # ================ Drop ================
+    async def drop(self) -> None:
+        """Drop the table which the client is connected to."""
+        async with self._engine.begin() as conn:
+            await conn.run_sync(self._table.drop)
@@ -0,0 +1,123 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from pgvecto_rs.sdk.result import SearchResult
+from pgvecto_rs.utils import to_numpy
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SearchCache:
+    """In-process LRU cache of search results, bounded by a byte budget.
+
+    Cached results are shared between the callers that hit them and must not be
+    modified. A cache can be shared by clients of several collections, their
+    keys are prefixed by the collection. Writes made through a client clear the
+    entries of its collection, writes made by other processes are only seen
+    once `ttl` expires.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = None):
+        """Args:
+        ----
+            max_bytes: estimated size of the cached results at most.
+            ttl: seconds an entry stays valid, None to keep it until evicted.
+
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[SearchResult, float, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        # bumped by clear, so that searches running across a write aren't cached
+        self.generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        embedding, *args: Hashable, namespace: Optional[Hashable] = None
+    ) -> Tuple[Hashable, ...]:
+        """Key of a search for `embedding`, with the other arguments in `args`,
+        in the entries of `namespace`, e.g. a collection.
+        """
+        data = np.ascontiguousarray(to_numpy(embedding), dtype="<f4").tobytes()
+        return (namespace, hashlib.blake2b(data, digest_size=16).digest(), *args)
+
+    def get(self, key: Hashable) -> Optional[SearchResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, result: SearchResult, generation: int) -> None:
+        """Cache `result`, unless the cache was cleared since `generation` was read."""
+        size = _result_bytes(result)
+        if size > self.max_bytes:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (result, expires, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self, namespace: Optional[Hashable] = None) -> None:
+        """Remove the entries of `namespace`, all of them if None."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                for key in [key for key in self._entries if key[0] == namespace]:
+                    self._pop(key)
+            self.generation += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries), self._bytes)
+
+    def _pop(self, key: Hashable) -> None:
+        self._bytes -= self._entries.pop(key)[2]
+
+
+def _result_bytes(result: SearchResult) -> int:
+    # an estimate: arrays are exact, ids, texts and metas are approximated
+    size = sys.getsizeof(result) + result.distances.nbytes
+    size += len(result.ids) * (sys.getsizeof(result.ids[0]) if result.ids else 0)
+    if result.embeddings is not None:
+        size += result.embeddings.nbytes
+    if result.texts is not None:
+        size += sum(sys.getsizeof(text) for text in result.texts)
+    if result.metas is not None:
+        size += sum(len(repr(meta)) for meta in result.metas)
+    return size
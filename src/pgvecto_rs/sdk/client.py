@@ -1,30 +1,107 @@
-from typing import List, Literal, Optional, Tuple, Type, Union
-from uuid import UUID
+import functools
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from uuid import UUID, uuid4
 
+import numpy as np
 from numpy import ndarray
 from sqlalchemy import (
     BIGINT,
+    ClauseElement,
     Column,
     ColumnElement,
+    Delete,
+    Executable,
     Float,
+    Index,
+    Insert,
+    Integer,
+    MetaData,
+    Row,
+    Select,
+    Table,
+    any_,
+    bindparam,
+    cast,
+    column,
     create_engine,
     delete,
     func,
-    insert,
+    or_,
     select,
+    tablesample,
     text,
+    true,
+    union_all,
+    values,
 )
 from sqlalchemy.dialects import postgresql
-from sqlalchemy.dialects.postgresql.pg_catalog import pg_class
+from sqlalchemy.dialects.postgresql.pg_catalog import (
+    pg_am,
+    pg_class,
+    pg_get_indexdef,
+    pg_index,
+)
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm.session import Session
 from sqlalchemy.types import String
 
-from pgvecto_rs.errors import CountRowsEstimateCondError
-from pgvecto_rs.sdk.filters import Filter
-from pgvecto_rs.sdk.record import Record, RecordORM, RecordORMType, Unique
-from pgvecto_rs.sqlalchemy import VECTOR
+from pgvecto_rs.errors import (
+    IndexBuildTimeoutError,
+    IndexRestoreError,
+    OptionValueError,
+    TypeNotFoundError,
+    VectorIndexUnusedWarning,
+)
+from pgvecto_rs.sdk.cache import SearchCache
+from pgvecto_rs.sdk.filters import Filter, FilterInput, meta_key
+from pgvecto_rs.sdk.record import Record, RecordORM, Unique
+from pgvecto_rs.sdk.result import RecordBatch, SearchPlan, SearchResult
+from pgvecto_rs.sqlalchemy import (
+    BVECTOR,
+    SVECTOR,
+    VECF16,
+    VECTOR,
+    VectorIndex,
+    bulk_insert,
+    opclass_for,
+    set_search_option,
+)
+from pgvecto_rs.types import (
+    BinaryVector,
+    Flat,
+    Hnsw,
+    IndexOption,
+    Ivf,
+    Optimizing,
+    SearchOption,
+)
+from pgvecto_rs.types.index import _DEFINITION_OPTIONS
+from pgvecto_rs.utils import HAS_PREWARM, sample_percent, to_numpy
 
 
 def table_factory(collection_name, dimension, table_args, base_class=RecordORM):
@@ -50,70 +127,691 @@ def table_factory(collection_name, dimension, table_args, base_class=RecordORM):
     return newclass
 
 
+def _conflict_key(row: dict, columns: List[str]) -> tuple:
+    key = []
+    for name in columns:
+        value = row[name]
+        if name == "meta":
+            value = json.dumps(value, sort_keys=True)
+        elif name == "embedding":
+            value = np.asarray(value, dtype=np.float32).tobytes()
+        key.append(value)
+    return tuple(key)
+
+
+VectorType = Literal["vector", "vecf16", "bvector", "svector"]
+DistanceOp = Literal["<->", "<=>", "<#>", "<~>"]
+_VECTOR_TYPES = {
+    "vector": VECTOR,
+    "vecf16": VECF16,
+    "bvector": BVECTOR,
+    "svector": SVECTOR,
+}
+_SCAN_DONE = object()
+_INDEX_NAME_UNSAFE = re.compile(r"\W")
+_RECORD_COLUMNS = ("id", "text", "meta", "embedding")
+# undefined_table and undefined_object, e.g. type "vector"
+_MISSING_SCHEMA_CODES = {"42P01", "42704"}
+_HAS_PREWARM = text(HAS_PREWARM)
+_OPCLASS = re.compile(r"(\w+_ops)\)")
+# the index statistics view of pgvecto.rs
+_INDEX_STAT = Table(
+    "pg_vector_index_stat",
+    MetaData(),
+    Column("tablerelid", postgresql.OID),
+    Column("indexrelid", postgresql.OID),
+    Column("indexname", String),
+    Column("idx_indexing", postgresql.BOOLEAN),
+    Column("idx_tuples", BIGINT),
+    Column("idx_sealed", postgresql.ARRAY(BIGINT)),
+    Column("idx_growing", postgresql.ARRAY(BIGINT)),
+    Column("idx_write", BIGINT),
+    Column("idx_size", BIGINT),
+)
+
+
+def _encode(table: Table, embedding):
+    """Turn float embeddings into values of the vector type of `table`.
+
+    Bits of a `bvector` are the signs of the floats. The codecs of the other
+    types convert float32 embeddings themselves.
+    """
+    if isinstance(table.c.embedding.type, BVECTOR) and not isinstance(
+        embedding, BinaryVector
+    ):
+        return np.asarray(to_numpy(embedding)) > 0
+    return embedding
+
+
+class CollectionStats(NamedTuple):
+    table_bytes: int
+    index_bytes: int
+    live_rows: int
+    dead_rows: int
+
+
+class VectorIndexInfo(NamedTuple):
+    """A vector index of a collection."""
+
+    name: str
+    opclass: str
+    option: IndexOption
+    # bytes of the index data kept by pgvecto.rs
+    size: int
+    # index scans since the statistics were reset, 0 if the planner never used it
+    scans: int
+    definition: str
+
+
+class IndexStats(NamedTuple):
+    """State of a vector index, read from `pg_vector_index_stat`."""
+
+    name: str
+    # True while rows are being moved into the index in the background
+    indexing: bool
+    tuples: int
+    # rows in each built segment, and in each segment still being written
+    sealed: List[int]
+    growing: List[int]
+    write: int
+    size: int
+
+
+class WarmupReport(NamedTuple):
+    seconds: float
+    # blocks read by pg_prewarm, None when the extension isn't installed
+    prewarmed_blocks: Optional[int]
+    queries: int
+
+
+class StorageReport(NamedTuple):
+    """Sizes of a collection. Embedding sizes are averages over sampled rows."""
+
+    table_bytes: int
+    index_bytes: int
+    embedding_bytes: float
+    float32_embedding_bytes: float
+
+    @property
+    def saved(self) -> float:
+        """Fraction of the embedding storage saved compared with float32 vectors."""
+        if not self.float32_embedding_bytes:
+            return 0.0
+        return 1 - self.embedding_bytes / self.float32_embedding_bytes
+
+
+# Statement builders shared by PGVectoRs and AsyncPGVectoRs
+def collection_table(
+    collection_name: str,
+    dimension: int,
+    constraints: Union[List[Unique], None] = None,
+    vector_type: VectorType = "vector",
+) -> Table:
+    """Return the table of a collection.
+
+    Tables are cached per (collection, dimension, constraints), each one in a
+    `MetaData` of its own, so opening many collections doesn't grow a shared
+    registry and tables evicted from the cache are freed.
+    """
+    if vector_type not in _VECTOR_TYPES:
+        raise OptionValueError(
+            "vector_type", vector_type, f"one of {tuple(_VECTOR_TYPES)}"
+        )
+    uniques = tuple(constraint.value for constraint in constraints or ())
+    return _collection_table(collection_name, dimension, uniques, vector_type)
+
+
+@functools.lru_cache(maxsize=1024)
+def _collection_table(
+    collection_name: str, dimension: int, uniques: tuple, vector_type: str
+) -> Table:
+    return Table(
+        f"collection_{collection_name}",
+        MetaData(),
+        Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        Column("text", String),
+        Column("meta", postgresql.JSONB),
+        Column("embedding", _VECTOR_TYPES[vector_type](dimension)),
+        *[Unique.from_value(value).make() for value in uniques],
+    )
+
+
+def _vector_type(table: Table) -> VectorType:
+    return next(
+        name
+        for name, typ in _VECTOR_TYPES.items()
+        if isinstance(table.c.embedding.type, typ)
+    )
+
+
+def _uuid_ranges(parts: int) -> List[Tuple[UUID, Optional[UUID]]]:
+    # ids are random, equal ranges of the UUID space hold about as many rows
+    bounds = [UUID(int=i * (1 << 128) // parts) for i in range(parts)]
+    return list(zip(bounds, [*bounds[1:], None]))
+
+
+def _upsert_stmts(
+    table: Table,
+    records: List[Record],
+    on: Optional[Unique],
+    batch_size: int,
+    skip_unchanged: bool,
+) -> Iterator[Insert]:
+    conflict = ["id"] if on is None else on.columns()
+    updates = [c for c in ("text", "meta", "embedding") if c not in conflict]
+    rows = {}
+    for record in records:
+        row = {
+            "id": record.id,
+            "text": record.text,
+            "meta": record.meta,
+            "embedding": _encode(table, to_numpy(record.embedding)),
+        }
+        # a statement cannot update the same row twice, the last record wins
+        rows[_conflict_key(row, conflict)] = row
+    rows = list(rows.values())
+
+    stmt = postgresql.insert(table)
+    where = None
+    if skip_unchanged:
+        where = or_(*[table.c[c].is_distinct_from(stmt.excluded[c]) for c in updates])
+    for start in range(0, len(rows), batch_size):
+        batch = stmt.values(rows[start : start + batch_size])
+        yield batch.on_conflict_do_update(
+            index_elements=conflict,
+            set_={c: batch.excluded[c] for c in updates},
+            where=where,
+        )
+
+
+def _projection(
+    table: Table,
+    include: Optional[Sequence[str]],
+    exclude: Optional[Sequence[str]],
+    ids_only: bool,
+) -> List[Column]:
+    # the id is always selected, the other columns are read only when asked for
+    if include is not None and exclude is not None:
+        raise OptionValueError("exclude", exclude, "None when include is set")
+    for name in (*(include or ()), *(exclude or ())):
+        if name not in _RECORD_COLUMNS:
+            raise OptionValueError("column", name, f"one of {_RECORD_COLUMNS}")
+    if ids_only:
+        names = ()
+    elif include is not None:
+        names = include
+    else:
+        names = [name for name in _RECORD_COLUMNS if name not in (exclude or ())]
+    return [table.c.id, *[table.c[n] for n in _RECORD_COLUMNS[1:] if n in names]]
+
+
+def _search_stmt(  # noqa: PLR0913
+    table: Table,
+    columns: List[Column],
+    embedding: Union[ndarray, List[float]],
+    distance_op: str,
+    top_k: int,
+    filter: Optional[Filter],
+) -> Select:
+    stmt = (
+        select(
+            *columns,
+            table.c.embedding.op(distance_op, return_type=Float)(
+                _encode(table, embedding),
+            ).label("distance"),
+        )
+        .limit(top_k)
+        .order_by("distance")
+    )
+    if filter is not None:
+        stmt = stmt.where(filter(table.c))
+    return stmt
+
+
+def _search_batch_stmt(  # noqa: PLR0913
+    table: Table,
+    columns: List[Column],
+    rows: List[Tuple[int, Union[ndarray, List[float]]]],
+    distance_op: str,
+    top_k: int,
+    filter: Optional[Filter],
+) -> Select:
+    # the queries are numbered by a VALUES list joined LATERAL to the KNN search
+    vector_type = table.c.embedding.type
+    queries = values(
+        column("ord", Integer),
+        column("embedding", vector_type),
+        name="queries",
+    ).data([(i, _encode(table, embedding)) for i, embedding in rows])
+    distance = table.c.embedding.op(distance_op, return_type=Float)(
+        cast(queries.c.embedding, vector_type),
+    ).label("distance")
+    knn = select(*columns, distance).order_by(distance).limit(top_k)
+    if filter is not None:
+        knn = knn.where(filter(table.c))
+    knn = knn.lateral("knn")
+    return (
+        select(queries.c.ord, knn)
+        .select_from(queries)
+        .join(knn, true())
+        .order_by(queries.c.ord, knn.c.distance)
+    )
+
+
+def _fetch_stmt(table: Table, ids: List[UUID]) -> Select:
+    return select(table.c.id, table.c.text, table.c.meta, table.c.embedding).where(
+        table.c.id.in_(ids)
+    )
+
+
+def _in_order(ids: List[UUID], rows: Iterable[Row]) -> List[Record]:
+    records = {row.id: Record.from_row(row) for row in rows}
+    return [records[id] for id in ids if id in records]
+
+
+def _group_by_query(
+    queries: int, rows: Iterable[Row], columns: List[Column], dimension: int
+) -> List[SearchResult]:
+    grouped: List[List[Row]] = [[] for _ in range(queries)]
+    for row in rows:
+        grouped[row.ord].append(row)
+    names = [c.name for c in columns]
+    return [SearchResult.from_rows(group, names, dimension) for group in grouped]
+
+
+def _insert_columns(
+    texts: Sequence[str],
+    metas: Optional[Sequence[dict]],
+    ids: Optional[Sequence[UUID]],
+) -> Dict[str, Sequence]:
+    ids = list(ids) if ids is not None else [uuid4() for _ in texts]
+    metas = metas if metas is not None else [{} for _ in texts]
+    return {"id": ids, "text": texts, "meta": metas}
+
+
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, with `ANALYZE` and `BUFFERS` if
+    `analyze` is set.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, stmt: Select, analyze: bool = False):
+        self.stmt = stmt
+        self.analyze = analyze
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.stmt, **kw)
+
+
+def _regclass(table: Table) -> ColumnElement:
+    return func.cast(table.name, postgresql.REGCLASS)
+
+
+def _row_count_stmt(
+    table: Table,
+    estimate: bool,
+    filter: Optional[Filter],
+    sample: Optional[float] = None,
+) -> Union[Select, _Explain]:
+    if sample is not None:
+        if not estimate:
+            raise OptionValueError("sample", sample, "None when estimate is False")
+        if not 0 < sample <= 100:  # noqa: PLR2004
+            raise OptionValueError("sample", sample, "a percentage in (0, 100]")
+        sampled = tablesample(table, func.system(sample))
+        rows = func.count("*") * (100.0 / sample)
+        stmt = select(func.cast(rows, BIGINT).label("rows")).select_from(sampled)
+        if filter is not None:
+            stmt = stmt.where(filter(sampled.c))
+        return stmt
+    if estimate and filter is not None:
+        # the number of rows the planner expects the filter to match
+        return _Explain(select(table.c.id).where(filter(table.c)))
+    if estimate:
+        return (
+            select(func.cast(Column("reltuples", Float), BIGINT).label("rows"))
+            .select_from(pg_class)
+            .where(Column("oid", Float) == _regclass(table))
+        )
+    stmt = select(func.count("*").label("rows")).select_from(table)
+    if filter is not None:
+        stmt = stmt.where(filter(table.c))
+    return stmt
+
+
+def _row_count(value: Any) -> int:
+    """Rows counted by a `_row_count_stmt`, or estimated by its plan."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if isinstance(value, list):
+        return int(value[0]["Plan"]["Plan Rows"])
+    return int(value)
+
+
+def _stats_stmt(table: Table) -> Select:
+    oid = _regclass(table)
+    return select(
+        func.pg_table_size(oid),
+        func.pg_indexes_size(oid),
+        func.pg_stat_get_live_tuples(oid),
+        func.pg_stat_get_dead_tuples(oid),
+    )
+
+
+def _vector_indexes_stmt(table: Table) -> Select:
+    return (
+        select(pg_class.c.relname, pg_get_indexdef(pg_index.c.indexrelid))
+        .select_from(pg_index)
+        .join(pg_class, pg_class.c.oid == pg_index.c.indexrelid)
+        .join(pg_am, pg_am.c.oid == pg_class.c.relam)
+        .where(pg_index.c.indrelid == _regclass(table), pg_am.c.amname == "vectors")
+        .order_by(pg_class.c.relname)
+    )
+
+
+def _index_info_stmt(table: Table) -> Select:
+    return (
+        _vector_indexes_stmt(table)
+        .add_columns(
+            _INDEX_STAT.c.idx_size, func.pg_stat_get_numscans(pg_index.c.indexrelid)
+        )
+        .outerjoin(_INDEX_STAT, _INDEX_STAT.c.indexrelid == pg_index.c.indexrelid)
+    )
+
+
+def _with_threads(indexdef: str, threads: int) -> str:
+    """Set `optimizing_threads` in the options of an index definition, adding
+    the options to a definition without them.
+    """
+    option = IndexOption.loads(indexdef)
+    if option.optimizing is None:
+        option.optimizing = Optimizing()
+    option.optimizing.threads = option.threads = threads
+    if _DEFINITION_OPTIONS.search(indexdef) is None:
+        # the storage parameters come before the predicate of a partial index
+        head, where, predicate = indexdef.partition(" WHERE ")
+        return f"{head} WITH (options = $${option.dumps()}$$){where}{predicate}"
+    options = "options='{}'".format(option.dumps().replace("'", "''"))
+    return _DEFINITION_OPTIONS.sub(lambda _: options, indexdef, count=1)
+
+
+def _prewarm_stmt(table: Table) -> Select:
+    # the vector indexes are kept by pgvecto.rs outside of the shared buffers
+    indexes = (
+        select(cast(pg_index.c.indexrelid, postgresql.REGCLASS))
+        .join(pg_class, pg_class.c.oid == pg_index.c.indexrelid)
+        .join(pg_am, pg_am.c.oid == pg_class.c.relam)
+        .where(pg_index.c.indrelid == _regclass(table), pg_am.c.amname != "vectors")
+    )
+    relations = union_all(select(_regclass(table).label("oid")), indexes).subquery()
+    return select(func.sum(func.pg_prewarm(relations.c.oid)))
+
+
+def _warmup_stmt(
+    table: Table, distance_op: str, queries: int, top_k: int, percent: float
+) -> Select:
+    # embeddings sampled from the table, each joined LATERAL to its KNN search
+    sampled = tablesample(table, func.system(percent), name="sampled")
+    samples = (
+        select(sampled.c.embedding, func.row_number().over().label("n"))
+        .limit(queries)
+        .subquery("samples")
+    )
+    distance = table.c.embedding.op(distance_op, return_type=Float)(samples.c.embedding)
+    knn = select(table.c.id).order_by(distance).limit(top_k).lateral("knn")
+    return (
+        select(func.count(func.distinct(samples.c.n)))
+        .select_from(samples)
+        .join(knn, true())
+    )
+
+
+def _delete_by_ids_filter(ids: Sequence[UUID]) -> Filter:
+    # a single array parameter, whatever the number of ids
+    ids_param = bindparam(None, list(ids), postgresql.ARRAY(postgresql.UUID))
+
+    def filter(record: FilterInput) -> ColumnElement[bool]:
+        return record.id == any_(ids_param)
+
+    return filter
+
+
+def _delete_stmts(
+    table: Table,
+    filter: Optional[Filter],
+    ids: Optional[Sequence[UUID]],
+    chunk_size: Optional[int],
+) -> Tuple[Iterable[Delete], Optional[int]]:
+    """Statements deleting the rows of `ids` or matching `filter`, chunk by chunk.
+
+    Returns the statements, and the size of a chunk when the same statement is
+    repeated until it deletes fewer rows.
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise OptionValueError("chunk_size", chunk_size, "a positive integer")
+    if ids is not None:
+        ids = list(ids)
+        step = chunk_size or max(len(ids), 1)
+        return [
+            delete(table).where(_delete_by_ids_filter(ids[i : i + step])(table.c))
+            for i in range(0, len(ids), step)
+        ], None
+    where = () if filter is None else (filter(table.c),)
+    if chunk_size is None:
+        return [delete(table).where(*where)], None
+    chunk = select(table.c.id).where(*where).limit(chunk_size)
+    return itertools.repeat(delete(table).where(table.c.id.in_(chunk))), chunk_size
+
+
+def _is_missing_schema(err: Union[ProgrammingError, TypeNotFoundError]) -> bool:
+    # the vector types are looked up by the binary COPY of psycopg
+    if isinstance(err, TypeNotFoundError):
+        return True
+    code = getattr(err.orig, "sqlstate", None) or getattr(err.orig, "pgcode", None)
+    return code in _MISSING_SCHEMA_CODES
+
+
+def _verify_schema(method):
+    """Create the schema of a client in `assume_schema` mode when `method` fails
+    because it is missing, then run `method` again.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        assume_schema = self._assume_schema
+        try:
+            return method(self, *args, **kwargs)
+        except (ProgrammingError, TypeNotFoundError) as err:
+            if not assume_schema or not _is_missing_schema(err):
+                raise
+        # concurrent first calls create the schema once
+        with self._schema_lock:
+            if self._assume_schema:
+                self._create_schema()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class PGVectoRs:
     _engine: Engine
-    _table: Type[RecordORM]
+    _table: Table
     dimension: int
 
     def __init__(  # noqa: PLR0913
         self,
-        db_url: str,
+        db_url: Union[str, Engine],
         collection_name: str,
         dimension: int,
         recreate: bool = False,
         constraints: Union[List[Unique], None] = None,
+        assume_schema: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = False,
+        pool_recycle: int = -1,
+        cache: Optional[SearchCache] = None,
+        vector_type: VectorType = "vector",
     ) -> None:
         """Connect to an existing table or create a new empty one.
         If the `recreate=True`, the table will be dropped if it exists.
 
         Args:
         ----
-            db_url (str): url to the database.
+            db_url (str | Engine): url to the database, or an engine shared with other clients.
             collection_name (str): name of the collection. A prefix `collection_` is added to actual table name.
             dimension (int): dimension of the embeddings.
             recreate (bool): drop the table if it exists. Defaults to False.
             constraints (List[Unique]): add constraints to columns, e.g. UNIQUE constraint
+            assume_schema (bool): skip creating the extension and the table at startup.
+                They are created on the first statement failing because they are missing.
+            pool_size (int): connections kept open by the pool, unused when `db_url` is an engine.
+            max_overflow (int): connections opened beyond `pool_size` under load.
+            pool_pre_ping (bool): test connections for liveness on checkout.
+            pool_recycle (int): seconds after which a connection is replaced, -1 to never.
+            cache (SearchCache): cache the results of `search`, possibly shared
+                with clients of other collections. Writes made through this
+                client clear the entries of its collection.
+            vector_type (str): type of the embedding column: "vector" (float32),
+                "vecf16" (float16), "bvector" (one bit per dimension, the sign of
+                the floats) or "svector" (sparse). Float32 embeddings given to the
+                client are converted to it.
         """
-        if constraints is None or len(constraints) == 0:
-            table_args = {"extend_existing": True}
+        if isinstance(db_url, Engine):
+            self._engine = db_url
         else:
-            table_args = (
-                *[col.make() for col in constraints],
-                {"extend_existing": True},
+            self._engine = create_engine(
+                db_url,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
             )
+        self._table = collection_table(
+            collection_name, dimension, constraints, vector_type
+        )
+        self.dimension = dimension
+        self.cache = cache
+        # entries of a cache shared with clients of other collections
+        self._cache_namespace = (self._table.name, vector_type)
+        self._stats: Optional[Tuple[float, CollectionStats]] = None
+        self._assume_schema = assume_schema and not recreate
+        self._schema_lock = threading.Lock()
+        if not self._assume_schema:
+            self._create_schema(recreate)
 
-        self._engine = create_engine(db_url)
-        self._table = table_factory(collection_name, dimension, table_args)
+    def _create_schema(self, recreate: bool = False) -> None:
         with Session(self._engine) as session:
             session.execute(text("CREATE EXTENSION IF NOT EXISTS vectors"))
             if recreate:
-                session.execute(
-                    text(f"DROP TABLE IF EXISTS {self._table.__tablename__}")
-                )
+                session.execute(text(f"DROP TABLE IF EXISTS {self._table.name}"))
             session.commit()
-        self._table.__table__.create(self._engine, checkfirst=True)
-        self.dimension = dimension
+        self._table.create(self._engine, checkfirst=True)
+        self._assume_schema = False
+
+    def insert(self, records: List[Record], batch_size: int = 1000) -> None:
+        """Insert records in one transaction.
+
+        Binary COPY is used when the driver is psycopg, batched multi-row
+        inserts otherwise.
+        """
+        if len(records) == 0:
+            return
+        self.insert_array(
+            [to_numpy(record.embedding) for record in records],
+            [record.text for record in records],
+            [record.meta for record in records],
+            ids=[record.id for record in records],
+            batch_size=batch_size,
+        )
+
+    @_verify_schema
+    def insert_array(  # noqa: PLR0913
+        self,
+        embeddings: Union[ndarray, Sequence[Sequence[float]]],
+        texts: Sequence[str],
+        metas: Optional[Sequence[dict]] = None,
+        ids: Optional[Sequence[UUID]] = None,
+        batch_size: int = 1000,
+    ) -> List[UUID]:
+        """Insert a 2-D array of embeddings and their texts in one transaction.
+
+        Args:
+        ----
+            embeddings: 2-D array, one embedding per row.
+            texts: text of each row.
+            metas: meta of each row. Defaults to empty dicts.
+            ids: id of each row. Defaults to random UUIDs.
+            batch_size: rows per statement when COPY is not available.
+
+        Returns:
+        -------
+            Ids of the inserted rows.
 
-    def insert(self, records: List[Record]) -> None:
+        """
+        columns = _insert_columns(texts, metas, ids)
         with Session(self._engine) as session:
-            for record in records:
-                session.execute(
-                    insert(self._table).values(
-                        id=record.id,
-                        text=record.text,
-                        meta=record.meta,
-                        embedding=record.embedding,
-                    ),
-                )
+            bulk_insert(
+                session,
+                self._table,
+                _encode(self._table, embeddings),
+                columns=columns,
+                batch_size=batch_size,
+            )
+            session.commit()
+            self._invalidate()
+        return columns["id"]
+
+    @_verify_schema
+    def upsert(
+        self,
+        records: List[Record],
+        on: Optional[Unique] = None,
+        batch_size: int = 1000,
+        skip_unchanged: bool = False,
+    ) -> int:
+        """Insert records, updating the rows they conflict with.
+
+        Args:
+        ----
+            records: records to write.
+            on: unique constraint to detect conflicts with. Defaults to the id.
+            batch_size: rows per `INSERT ... ON CONFLICT DO UPDATE` statement.
+            skip_unchanged: leave a row untouched when none of its columns would
+                change, so rewrites don't touch the vector index.
+
+        Returns:
+        -------
+            Number of inserted or updated rows.
+
+        """
+        count = 0
+        with Session(self._engine) as session:
+            for stmt in _upsert_stmts(
+                self._table, records, on, batch_size, skip_unchanged
+            ):
+                count += session.execute(stmt).rowcount
             session.commit()
+            self._invalidate()
+        return count
 
-    def search(
+    @_verify_schema
+    def search(  # noqa: PLR0913
         self,
         embedding: Union[ndarray, List[float]],
-        distance_op: Literal["<->", "<=>", "<#>"] = "<->",
+        distance_op: DistanceOp = "<->",
         top_k: int = 4,
         filter: Optional[Filter] = None,
-    ) -> List[Tuple[Record, float]]:
+        search_option: Optional[SearchOption] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        ids_only: bool = False,
+        explain: bool = False,
+    ) -> SearchResult:
         """Search for the nearest records.
 
         Args:
@@ -123,71 +821,617 @@ class PGVectoRs:
             top_k : Max records to return. Defaults to 4.
             filter : Read our document. Defaults to None.
             order_by_dis : Order by distance. Defaults to True.
+            search_option : Tune ef_search, nprobe or search mode for this search only.
+            include : Columns of the records to read among text, meta and embedding.
+                The others are left to None. Defaults to all of them.
+            exclude : Columns of the records not to read, e.g. ["embedding"].
+            ids_only : Only read the ids of the records.
+            explain : Also run the search with `EXPLAIN (ANALYZE, BUFFERS)`, set
+                its plan and timing to `result.plan` and warn with a
+                `VectorIndexUnusedWarning` if no vector index is scanned. The
+                cache is bypassed.
 
         Returns:
         -------
-            List of records and corresponding distances.
+            The records and corresponding distances, held column by column.
+            Iterating yields (record, distance) tuples.
 
         """
-        with Session(self._engine) as session:
-            stmt = (
-                select(
-                    self._table,
-                    self._table.embedding.op(distance_op, return_type=Float)(
-                        embedding,
-                    ).label("distance"),
-                )
-                .limit(top_k)
-                .order_by("distance")
+        columns = _projection(self._table, include, exclude, ids_only)
+        names = [c.name for c in columns]
+        if explain:
+            return self._explain_search(
+                columns, embedding, distance_op, top_k, filter, search_option
+            )
+        if self.cache is not None:
+            key = SearchCache.key(
+                embedding,
+                distance_op,
+                top_k,
+                # filters of the DSL are equal when built alike
+                getattr(filter, "cache_key", filter),
+                search_option and tuple(search_option.dump().items()),
+                *names,
+                namespace=self._cache_namespace,
             )
-            if filter is not None:
-                stmt = stmt.where(filter(self._table))
+            generation = self.cache.generation
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        stmt = _search_stmt(self._table, columns, embedding, distance_op, top_k, filter)
+        with Session(self._engine) as session:
+            if search_option is not None:
+                set_search_option(session, search_option)
             res = session.execute(stmt)
-            return [(Record.from_orm(row[0]), row[1]) for row in res]
+            result = SearchResult.from_rows(res.all(), names, self.dimension)
+        if self.cache is not None:
+            self.cache.put(key, result, generation)
+        return result
+
+    def _explain_search(  # noqa: PLR0913
+        self,
+        columns: List[Column],
+        embedding: Union[ndarray, List[float]],
+        distance_op: DistanceOp,
+        top_k: int,
+        filter: Optional[Filter],
+        search_option: Optional[SearchOption],
+    ) -> SearchResult:
+        stmt = _search_stmt(self._table, columns, embedding, distance_op, top_k, filter)
+        with Session(self._engine) as session:
+            if search_option is not None:
+                set_search_option(session, search_option)
+            plan = SearchPlan.from_explain(
+                session.execute(_Explain(stmt, analyze=True)).scalar_one()
+            )
+            rows = session.execute(stmt).all()
+        if not plan.uses_index:
+            warnings.warn(VectorIndexUnusedWarning(self._table.name), stacklevel=4)
+        result = SearchResult.from_rows(rows, [c.name for c in columns], self.dimension)
+        result.plan = plan
+        return result
+
+    @_verify_schema
+    def search_batch(  # noqa: PLR0913
+        self,
+        embeddings: Union[ndarray, List[List[float]]],
+        distance_op: DistanceOp = "<->",
+        top_k: int = 4,
+        filter: Optional[Filter] = None,
+        search_option: Optional[SearchOption] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        ids_only: bool = False,
+    ) -> List[SearchResult]:
+        """Search for the nearest records of several embeddings in one statement.
+
+        Args:
+        ----
+            embeddings : Target embeddings, one per query.
+            distance_op : Distance op.
+            top_k : Max records to return per query. Defaults to 4.
+            filter : Read our document. Defaults to None.
+            search_option : Tune ef_search, nprobe or search mode for this search only.
+            include : Columns of the records to read among text, meta and embedding.
+                The others are left to None. Defaults to all of them.
+            exclude : Columns of the records not to read, e.g. ["embedding"].
+            ids_only : Only read the ids of the records.
+
+        Returns:
+        -------
+            For each embedding, in order, the records and corresponding distances.
+
+        """
+        rows = list(enumerate(embeddings))
+        if not rows:
+            return []
+        columns = _projection(self._table, include, exclude, ids_only)
+        stmt = _search_batch_stmt(
+            self._table, columns, rows, distance_op, top_k, filter
+        )
+        with Session(self._engine) as session:
+            if search_option is not None:
+                set_search_option(session, search_option)
+            return _group_by_query(
+                len(rows), session.execute(stmt), columns, self.dimension
+            )
+
+    @_verify_schema
+    def fetch(self, ids: List[UUID]) -> List[Record]:
+        """Get the records of `ids`, in the same order. Missing ids are skipped."""
+        with Session(self._engine) as session:
+            return _in_order(ids, session.execute(_fetch_stmt(self._table, ids)))
+
+    # ================ Scan ==================
+    def scan(
+        self,
+        batch_size: int = 1000,
+        filter: Optional[Filter] = None,
+        columns: Optional[Sequence[str]] = None,
+        id_range: Optional[Tuple[UUID, Optional[UUID]]] = None,
+    ) -> Iterator[RecordBatch]:
+        """Iterate over the records of the collection, in batches ordered by id.
+
+        Pages are read by id (keyset pagination), so every batch costs the same
+        no matter how far the scan is. Each page is read in a transaction of its
+        own, records written during the scan may or may not be seen.
+
+        Args:
+        ----
+            batch_size: records per batch.
+            filter: only scan the records matching it.
+            columns: columns to read among text, meta and embedding, defaults to all.
+            id_range: only scan ids from the first, inclusive, to the second, exclusive.
+
+        """
+        projection = _projection(self._table, columns, None, False)
+        names = [c.name for c in projection]
+        stmt = select(*projection).order_by(self._table.c.id).limit(batch_size)
+        if filter is not None:
+            stmt = stmt.where(filter(self._table.c))
+        low, high = id_range or (None, None)
+        if high is not None:
+            stmt = stmt.where(self._table.c.id < high)
+
+        with self._engine.connect() as conn:
+            page = stmt if low is None else stmt.where(self._table.c.id >= low)
+            while True:
+                rows = conn.execute(page).all()
+                conn.rollback()
+                if not rows:
+                    return
+                yield RecordBatch.from_rows(rows, names, self.dimension)
+                if len(rows) < batch_size:
+                    return
+                page = stmt.where(self._table.c.id > rows[-1].id)
+
+    def scan_parallel(
+        self,
+        workers: int = 4,
+        batch_size: int = 1000,
+        filter: Optional[Filter] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[RecordBatch]:
+        """Like `scan`, with the id range split across `workers` threads, each on a
+        connection of its own. Batches are yielded as they are read, in no
+        particular order.
+        """
+        batches: queue.Queue = queue.Queue(maxsize=2 * workers)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        def work(id_range: Tuple[UUID, Optional[UUID]]) -> None:
+            try:
+                for batch in self.scan(batch_size, filter, columns, id_range):
+                    if not put(batch):
+                        return
+            except Exception as err:
+                put(err)
+            finally:
+                put(_SCAN_DONE)
+
+        with ThreadPoolExecutor(workers) as pool:
+            for id_range in _uuid_ranges(workers):
+                pool.submit(work, id_range)
+            try:
+                done = 0
+                while done < workers:
+                    item = batches.get()
+                    if item is _SCAN_DONE:
+                        done += 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
 
     # ================ Stat ==================
-    def row_count(self, estimate: bool = True, filter: Optional[Filter] = None) -> int:
-        if estimate and filter is not None:
-            raise CountRowsEstimateCondError()
-        if estimate:
-            stmt = (
-                select(func.cast(Column("reltuples", Float), BIGINT).label("rows"))
-                .select_from(pg_class)
-                .where(
-                    Column("oid", Float)
-                    == func.cast(self._table.__tablename__, postgresql.REGCLASS)
+    @_verify_schema
+    def row_count(
+        self,
+        estimate: bool = True,
+        filter: Optional[Filter] = None,
+        sample: Optional[float] = None,
+    ) -> int:
+        """Count the records, matching `filter` if it is given.
+
+        Args:
+        ----
+            estimate (bool): return an estimate instead of counting the rows: the
+                statistics of the table, or the rows the planner expects `filter`
+                to match.
+            filter (Filter): records to count.
+            sample (float): estimate by counting the rows of this percentage of
+                the table pages, read with `TABLESAMPLE SYSTEM`.
+        """
+        stmt = _row_count_stmt(self._table, estimate, filter, sample)
+        with Session(self._engine) as session:
+            return _row_count(session.execute(stmt).scalar_one())
+
+    def stats(self, max_age: float = 60.0) -> CollectionStats:
+        """Sizes and tuple counts of the table, from the statistics of Postgres.
+        Reuse the last result if it is younger than `max_age` seconds.
+        """
+        now = time.monotonic()
+        if self._stats is not None and now - self._stats[0] < max_age:
+            return self._stats[1]
+        with Session(self._engine) as session:
+            stats = CollectionStats(*session.execute(_stats_stmt(self._table)).one())
+        self._stats = (now, stats)
+        return stats
+
+    def storage(self, sample: int = 1000) -> StorageReport:
+        """Report the size of the collection, and the embedding storage saved by
+        its vector type compared with float32 vectors, measured on `sample` rows.
+        """
+        table = self._table
+        oid = _regclass(table)
+        sampled = select(table.c.embedding).limit(sample).subquery()
+        stmt = select(
+            func.pg_table_size(oid),
+            func.pg_indexes_size(oid),
+            func.avg(func.pg_column_size(sampled.c.embedding)),
+            func.avg(
+                func.pg_column_size(
+                    cast(sampled.c.embedding, VECTOR(self.dimension)),
+                ),
+            ),
+        ).select_from(sampled)
+        with Session(self._engine) as session:
+            table_bytes, index_bytes, embedding, float32 = session.execute(stmt).one()
+        return StorageReport(
+            table_bytes, index_bytes, float(embedding or 0), float(float32 or 0)
+        )
+
+    def warmup(
+        self,
+        queries: int = 64,
+        top_k: int = 10,
+        distance_op: DistanceOp = "<->",
+    ) -> WarmupReport:
+        """Load the collection and its vector indexes into memory, e.g. after a
+        restart or on a new replica, before a readiness probe succeeds.
+
+        The table and its other indexes are read into shared buffers with
+        `pg_prewarm` when the extension is installed. The vector indexes, kept
+        by pgvecto.rs outside of them, are read by searching with `distance_op`
+        for `queries` embeddings sampled from the table.
+        """
+        start = time.perf_counter()
+        blocks = None
+        ran = 0
+        with Session(self._engine) as session:
+            if session.execute(_HAS_PREWARM).scalar_one():
+                blocks = int(session.execute(_prewarm_stmt(self._table)).scalar_one())
+            if queries > 0:
+                rows = session.execute(
+                    _row_count_stmt(self._table, True, None)
+                ).scalar_one()
+                stmt = _warmup_stmt(
+                    self._table,
+                    distance_op,
+                    queries,
+                    top_k,
+                    sample_percent(rows or 0, queries),
                 )
-            )
-            with Session(self._engine) as session:
-                result = session.execute(stmt).fetchone()
-        else:
-            stmt = select(func.count("*").label("rows")).select_from(self._table)
-            if filter is not None:
-                stmt = stmt.where(filter(self._table))
-            with Session(self._engine) as session:
-                result = session.execute(stmt).fetchone()
-        return result[0]
+                ran = session.execute(stmt).scalar_one()
+        return WarmupReport(time.perf_counter() - start, blocks, ran)
 
     # ================ Delete ================
-    def delete(self, filter: Filter) -> None:
+    @_verify_schema
+    def delete(
+        self,
+        filter: Filter,
+        chunk_size: Optional[int] = None,
+        sleep: float = 0.0,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Delete the records matching `filter`.
+
+        Args:
+        ----
+            filter (Filter): records to delete.
+            chunk_size (int): delete at most this many rows per transaction, so
+                that locks are held briefly and vacuum keeps up, None to delete
+                in one transaction.
+            sleep (float): seconds to wait between two chunks.
+            progress (Callable[[int], None]): called with the number of rows
+                deleted so far after each chunk is committed.
+
+        Returns
+        -------
+            The number of deleted rows.
+        """
+        return self._delete(
+            *_delete_stmts(self._table, filter, None, chunk_size), sleep, progress
+        )
+
+    @_verify_schema
+    def delete_all(self, truncate: bool = False) -> None:
+        """Delete all the records, with `TRUNCATE` if `truncate` is set. `TRUNCATE`
+        frees the space at once but takes an exclusive lock on the table.
+        """
         with Session(self._engine) as session:
-            session.execute(delete(self._table).where(filter(self._table)))
+            if truncate:
+                session.execute(text(f"TRUNCATE TABLE {self._table.name}"))
+            else:
+                session.execute(delete(self._table))
             session.commit()
+            self._invalidate()
+
+    @_verify_schema
+    def delete_by_ids(
+        self,
+        ids: Sequence[UUID],
+        chunk_size: Optional[int] = None,
+        sleep: float = 0.0,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Delete the records of `ids`, sent as one array per chunk, see `delete`."""
+        return self._delete(
+            *_delete_stmts(self._table, None, ids, chunk_size), sleep, progress
+        )
+
+    def _delete(
+        self,
+        stmts: Iterable[Delete],
+        chunk_size: Optional[int],
+        sleep: float,
+        progress: Optional[Callable[[int], None]],
+    ) -> int:
+        total = 0
+        try:
+            with Session(self._engine) as session:
+                for i, stmt in enumerate(stmts):
+                    if i and sleep:
+                        time.sleep(sleep)
+                    count = session.execute(stmt).rowcount
+                    session.commit()
+                    total += count
+                    if progress is not None:
+                        progress(total)
+                    if chunk_size is not None and count < chunk_size:
+                        break
+        finally:
+            self._invalidate()
+        return total
+
+    # ================ Index ================
+    def create_meta_index(
+        self, keys: Optional[Sequence[str]] = None, concurrently: bool = False
+    ) -> List[str]:
+        """Index `meta` for filtered searches.
+
+        Without `keys`, a GIN index with `jsonb_path_ops` serves the `Eq`, `In`,
+        `Contains` and `Exists` filters. With `keys`, a B-tree index on the
+        numeric value of each key serves the `Range` filters on it.
+
+        Returns
+        -------
+            Names of the indexes, existing ones are left untouched.
+
+        """
+        table = self._table
+        if keys is None:
+            indexes = [
+                Index(
+                    f"{table.name}_meta_gin",
+                    table.c.meta,
+                    postgresql_using="gin",
+                    postgresql_ops={"meta": "jsonb_path_ops"},
+                    postgresql_concurrently=concurrently,
+                )
+            ]
+        else:
+            indexes = [
+                Index(
+                    f"{table.name}_meta_{_INDEX_NAME_UNSAFE.sub('_', key)}",
+                    meta_key(table.c.meta, key),
+                    postgresql_concurrently=concurrently,
+                )
+                for key in keys
+            ]
+        return self._create_indexes(indexes, concurrently)
+
+    def create_index(
+        self,
+        option: Union[IndexOption, Hnsw, Ivf, Flat],
+        distance_op: DistanceOp = "<->",
+        concurrently: bool = True,
+        name: Optional[str] = None,
+    ) -> str:
+        """Create a vector index serving searches with `distance_op`.
+
+        The rows are indexed in the background by pgvecto.rs, with the number of
+        threads of `IndexOption.threads`; follow the build with `index_stats` or
+        `wait_for_index`.
 
-    def delete_all(self) -> None:
+        Args:
+        ----
+            option (IndexOption | Hnsw | Ivf | Flat): the algorithm and options of
+                the index.
+            distance_op (str): the distance the index serves.
+            concurrently (bool): create the index without locking out writes.
+            name (str): name of the index, `{table}_{opclass}` if None.
+
+        Returns
+        -------
+            Name of the index, an existing one is left untouched.
+
+        """
+        table = self._table
+        opclass = opclass_for(table.c.embedding.type, distance_op)
+        index = VectorIndex(
+            name or f"{table.name}_{opclass}",
+            table.c.embedding,
+            option,
+            opclass=opclass,
+            concurrently=concurrently,
+        )
+        return self._create_indexes([index], concurrently)[0]
+
+    def drop_index(self, name: str, concurrently: bool = True) -> None:
+        """Drop the index `name` if it exists, without locking out searches and
+        writes if `concurrently` is set.
+        """
+        option = " CONCURRENTLY" if concurrently else ""
+        name = self._engine.dialect.identifier_preparer.quote(name)
+        with self._ddl_engine(concurrently).begin() as conn:
+            conn.exec_driver_sql(f"DROP INDEX{option} IF EXISTS {name}")
+
+    def reindex(self, name: str, concurrently: bool = True) -> None:
+        """Rebuild the index `name`. With `concurrently`, searches keep using the
+        old index until the new one replaces it.
+        """
+        option = " CONCURRENTLY" if concurrently else ""
+        name = self._engine.dialect.identifier_preparer.quote(name)
+        with self._ddl_engine(concurrently).begin() as conn:
+            conn.exec_driver_sql(f"REINDEX INDEX{option} {name}")
+
+    def list_indexes(self) -> List[VectorIndexInfo]:
+        """The vector indexes of the collection, with their parsed options."""
         with Session(self._engine) as session:
-            session.execute(delete(self._table))
-            session.commit()
+            rows = session.execute(_index_info_stmt(self._table)).all()
+        return [
+            VectorIndexInfo(
+                name,
+                match.group(1) if (match := _OPCLASS.search(definition)) else "",
+                IndexOption.loads(definition),
+                size or 0,
+                scans or 0,
+                definition,
+            )
+            for name, definition, size, scans in rows
+        ]
+
+    def index_stats(self, name: Optional[str] = None) -> List[IndexStats]:
+        """State of the vector indexes of the collection, or of the index `name`."""
+        stmt = select(
+            _INDEX_STAT.c.indexname,
+            _INDEX_STAT.c.idx_indexing,
+            _INDEX_STAT.c.idx_tuples,
+            _INDEX_STAT.c.idx_sealed,
+            _INDEX_STAT.c.idx_growing,
+            _INDEX_STAT.c.idx_write,
+            _INDEX_STAT.c.idx_size,
+        ).where(_INDEX_STAT.c.tablerelid == _regclass(self._table))
+        if name is not None:
+            stmt = stmt.where(_INDEX_STAT.c.indexname == name)
+        with Session(self._engine) as session:
+            return [IndexStats(*row) for row in session.execute(stmt)]
+
+    def wait_for_index(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        poll_interval: float = 1.0,
+        progress: Optional[Callable[[IndexStats], None]] = None,
+    ) -> IndexStats:
+        """Poll the index `name` until its rows are indexed.
+
+        Args:
+        ----
+            name (str): name of the index.
+            timeout (float): seconds to wait at most, None to wait forever.
+            poll_interval (float): seconds between two polls.
+            progress (Callable[[IndexStats], None]): called with each poll.
+
+        Raises
+        ------
+            IndexBuildTimeoutError: the index is still being built after `timeout`
+                seconds.
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stats = self.index_stats(name)
+            if not stats:
+                raise OptionValueError("name", name, "a vector index of the table")
+            if progress is not None:
+                progress(stats[0])
+            if not stats[0].indexing:
+                return stats[0]
+            if deadline is not None and time.monotonic() >= deadline:
+                raise IndexBuildTimeoutError(name, timeout)
+            time.sleep(poll_interval)
+
+    @contextmanager
+    def bulk_load(
+        self, threads: Optional[int] = None, wait: bool = False
+    ) -> Iterator["PGVectoRs"]:
+        """Defer the maintenance of the vector indexes while loading rows.
 
-    def delete_by_ids(self, ids: List[UUID]) -> None:
-        def filter(record: RecordORMType) -> ColumnElement[bool]:
-            return record.id.in_(ids)
+        The vector indexes of the collection are dropped on entry and created
+        again from their definitions on exit, even if the load fails, so that
+        rows inserted in between, e.g. with `insert_array` over binary COPY,
+        aren't indexed one by one. Searches scan the table meanwhile. If they
+        can't be created again, an `IndexRestoreError` carrying their
+        definitions is raised, caused by the error of the load if any.
 
+        Args:
+        ----
+            threads (int): build the indexes with this many threads instead of
+                the `optimizing_threads` of their definitions.
+            wait (bool): wait on exit until the rows are indexed.
+
+        """
         with Session(self._engine) as session:
-            session.execute(delete(self._table).where(filter(self._table)))
-            session.commit()
+            indexes = session.execute(_vector_indexes_stmt(self._table)).all()
+        if threads is not None:
+            indexes = [(name, _with_threads(d, threads)) for name, d in indexes]
+        dropped: List[str] = []
+        error: Optional[BaseException] = None
+        try:
+            for name, indexdef in indexes:
+                self.drop_index(name, concurrently=False)
+                dropped.append(indexdef)
+            yield self
+        except BaseException as err:
+            error = err
+            raise
+        finally:
+            try:
+                with self._engine.begin() as conn:
+                    for indexdef in dropped:
+                        conn.exec_driver_sql(indexdef)
+            except Exception as err:
+                # the error of the load, if any, is kept as the cause
+                raise IndexRestoreError(dropped) from error or err
+        if wait:
+            for name, _ in indexes:
+                self.wait_for_index(name)
+
+    def _create_indexes(self, indexes: List[Index], concurrently: bool) -> List[str]:
+        engine = self._ddl_engine(concurrently)
+        for index in indexes:
+            # the table is shared by the clients of the collection, and created
+            # again with its indexes on recreate
+            self._table.indexes.discard(index)
+            index.create(engine, checkfirst=True)
+        return [index.name for index in indexes]
+
+    def _ddl_engine(self, concurrently: bool) -> Engine:
+        # CONCURRENTLY can't run inside a transaction block
+        if concurrently:
+            return self._engine.execution_options(isolation_level="AUTOCOMMIT")
+        return self._engine
 
     # ================ Drop ================
     def drop(self) -> None:
         """Drop the table which the client is connected to."""
-        self._table.__table__.drop(self._engine)
+        self._table.drop(self._engine)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        if self.cache is not None:
+            self.cache.clear(self._cache_namespace)
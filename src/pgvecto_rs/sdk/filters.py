@@ -1,13 +1,175 @@
-from typing import Callable, Type
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Hashable, Optional, Sequence, Tuple, Type
 
-from sqlalchemy import ColumnElement
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    String,
+    Text,
+    and_,
+    bindparam,
+    cast,
+    false,
+    literal,
+    or_,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.expression import ColumnCollection
 
-from pgvecto_rs.sdk.record import RecordORMType
-
-Filter = Type[Callable[[RecordORMType], ColumnElement[bool]]]
-FilterInput = RecordORMType
+# the columns of the collection table: id, text, meta and embedding
+FilterInput = ColumnCollection
+Filter = Type[Callable[[FilterInput], ColumnElement[bool]]]
 FilterOutput = ColumnElement[bool]
 
 
 def meta_contains(meta_contains: dict) -> Filter:
     return lambda r: r.meta.contains(meta_contains)
+
+
+def meta_key(meta: Any, key: str) -> ColumnElement:
+    """`meta ->> 'key'` as a float, the expression indexed by
+    `PGVectoRs.create_meta_index(keys=[key])`.
+
+    The key is rendered inline, so that the planner can match the index.
+    """
+    key_param = bindparam(None, key, String, literal_execute=True)
+    return cast(meta.op("->>", return_type=Text)(key_param), Float)
+
+
+class MetaFilter(ABC):
+    """A declarative filter on the keys of `meta`.
+
+    Filters are combined with `&` and `|`. Values are sent as bound parameters
+    and `cache_key` identifies the filter, e.g. for a `SearchCache`.
+    """
+
+    cache_key: Tuple[Hashable, ...]
+
+    @abstractmethod
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        ...
+
+    def __and__(self, other: "MetaFilter") -> "MetaFilter":
+        return And(self, other)
+
+    def __or__(self, other: "MetaFilter") -> "MetaFilter":
+        return Or(self, other)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MetaFilter) and self.cache_key == other.cache_key
+
+    def __hash__(self) -> int:
+        return hash(self.cache_key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.cache_key[1:]}"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+class Eq(MetaFilter):
+    """`meta[key] == value` for a scalar value, served by the GIN index of `meta`."""
+
+    def __init__(self, key: str, value: Any):
+        self.key = key
+        self.value = value
+        self.cache_key = ("eq", key, _dumps(value))
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        return r.meta.contains({self.key: self.value})
+
+
+class In(MetaFilter):
+    """`meta[key]` is one of `values`, served by the GIN index of `meta`."""
+
+    def __init__(self, key: str, values: Sequence[Any]):
+        self.key = key
+        self.values = list(values)
+        self.cache_key = ("in", key, *sorted(map(_dumps, self.values)))
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        if not self.values:
+            return false()
+        return or_(*[r.meta.contains({self.key: value}) for value in self.values])
+
+
+class Contains(MetaFilter):
+    """The array `meta[key]` contains `value`, served by the GIN index of `meta`."""
+
+    def __init__(self, key: str, value: Any):
+        self.key = key
+        self.value = value
+        self.cache_key = ("contains", key, _dumps(value))
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        return r.meta.contains({self.key: [self.value]})
+
+
+class Exists(MetaFilter):
+    """`meta` has `key`, served by the GIN index of `meta`."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.cache_key = ("exists", key)
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        # `@?` is supported by jsonb_path_ops, unlike `?`
+        path = '$."{}"'.format(self.key.replace("\\", "\\\\").replace('"', '\\"'))
+        return r.meta.op("@?", return_type=postgresql.BOOLEAN)(
+            cast(path, postgresql.JSONPATH)
+        )
+
+
+class Range(MetaFilter):
+    """Bounds on the number `meta[key]`, served by the expression index of
+    `create_meta_index(keys=[key])`. The values of `key` must be numbers.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        key: str,
+        gt: Optional[float] = None,
+        ge: Optional[float] = None,
+        lt: Optional[float] = None,
+        le: Optional[float] = None,
+    ):
+        self.key = key
+        self.bounds = (gt, ge, lt, le)
+        self.cache_key = ("range", key, *self.bounds)
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        value = meta_key(r.meta, self.key)
+        gt, ge, lt, le = self.bounds
+        clauses = []
+        if gt is not None:
+            clauses.append(value > literal(gt, Float))
+        if ge is not None:
+            clauses.append(value >= literal(ge, Float))
+        if lt is not None:
+            clauses.append(value < literal(lt, Float))
+        if le is not None:
+            clauses.append(value <= literal(le, Float))
+        if not clauses:
+            return value.is_not(None)
+        return and_(*clauses)
+
+
+class And(MetaFilter):
+    def __init__(self, *filters: MetaFilter):
+        self.filters = filters
+        self.cache_key = ("and", *[f.cache_key for f in filters])
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        return and_(*[f(r) for f in self.filters])
+
+
+class Or(MetaFilter):
+    def __init__(self, *filters: MetaFilter):
+        self.filters = filters
+        self.cache_key = ("or", *[f.cache_key for f in filters])
+
+    def __call__(self, r: FilterInput) -> FilterOutput:
+        return or_(*[f(r) for f in self.filters])
@@ -0,0 +1,55 @@
+from typing import Sequence
+
+import numpy as np
+from numpy import ndarray
+
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.utils import DISTANCE_OPS
+
+
+def distances(data: ndarray, queries: ndarray, distance_op: str) -> ndarray:
+    """Distances between each query and each row of `data`, ordered like those
+    of pgvecto.rs, as a `(len(queries), len(data))` matrix.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    dot = queries @ data.T
+    if distance_op == "<->":
+        # squared L2, like pgvecto.rs
+        return (
+            np.einsum("ij,ij->i", queries, queries)[:, None]
+            - 2 * dot
+            + np.einsum("ij,ij->i", data, data)[None, :]
+        )
+    if distance_op == "<#>":
+        return -dot
+    if distance_op == "<=>":
+        norms = np.linalg.norm(queries, axis=1)[:, None] * np.linalg.norm(data, axis=1)
+        return 1 - dot / np.maximum(norms, np.finfo(np.float32).tiny)
+    if distance_op == "<~>":
+        # on binary vectors, the dot product counts the common bits
+        union = queries.sum(axis=1)[:, None] + data.sum(axis=1)[None, :] - dot
+        return 1 - dot / np.maximum(union, 1)
+    raise OptionValueError("distance_op", distance_op, f"one of {DISTANCE_OPS}")
+
+
+def exact_neighbors(
+    data: ndarray, queries: ndarray, distance_op: str, top_k: int
+) -> ndarray:
+    """Row numbers in `data` of the `top_k` nearest rows of each query, nearest
+    first, computed exhaustively.
+    """
+    matrix = distances(data, queries, distance_op)
+    top_k = min(top_k, matrix.shape[1])
+    nearest = np.argpartition(matrix, top_k - 1, axis=1)[:, :top_k]
+    order = np.take_along_axis(matrix, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def recall(found: Sequence, expected: Sequence) -> float:
+    """Share of `expected` in `found`, e.g. the ids returned by a search and the
+    ids of the exact nearest neighbors.
+    """
+    if len(expected) == 0:
+        return 1.0
+    return len(set(found) & set(expected)) / len(expected)
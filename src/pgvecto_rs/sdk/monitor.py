@@ -0,0 +1,180 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+from numpy import ndarray
+from sqlalchemy.orm.session import Session
+
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.sdk.client import DistanceOp, PGVectoRs, _projection, _search_stmt
+from pgvecto_rs.sdk.filters import Filter
+from pgvecto_rs.sdk.metrics import recall
+from pgvecto_rs.sdk.result import SearchResult
+from pgvecto_rs.sqlalchemy.search import apply_settings
+from pgvecto_rs.types import SearchOption
+
+# vector indexes are only read by index scans, without them the search is a
+# sequential scan computing every distance
+_EXACT_SETTINGS = {"enable_indexscan": "off", "enable_bitmapscan": "off"}
+
+
+class RecallSample(NamedTuple):
+    """A search compared to the exact search for the same query."""
+
+    # time.time() of the comparison
+    timestamp: float
+    # recall@k of the search against the exact nearest neighbors
+    recall: float
+    # mean excess of the i-th distance found over the i-th exact distance
+    distance_error: float
+    # seconds the exact search took
+    exact_seconds: float
+
+
+class RecallSummary(NamedTuple):
+    samples: int
+    recall: float
+    min_recall: float
+    distance_error: float
+
+
+class RecallMonitor:
+    """Measure recall@k of the searches of a collection against exact searches.
+
+    Recall regressions, e.g. from quantization, index options or data drift, do
+    not raise errors. The monitor compares searches with exact ones, run as a
+    sequential scan with index scans disabled by `SET LOCAL` in their
+    transaction, and keeps the last `history` comparisons.
+
+    Exact searches read the whole table. `observe` compares a search made by the
+    application with probability `sample_rate`, and at most once every
+    `min_interval` seconds, so that it can be called after every search in
+    production. `check` compares the searches of a query set, unthrottled.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client: PGVectoRs,
+        distance_op: DistanceOp = "<->",
+        top_k: int = 10,
+        sample_rate: float = 0.01,
+        min_interval: float = 1.0,
+        history: int = 1000,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise OptionValueError("sample_rate", sample_rate, "between 0 and 1")
+        self.client = client
+        self.distance_op = distance_op
+        self.top_k = top_k
+        self.sample_rate = sample_rate
+        self.min_interval = min_interval
+        self._history: Deque[RecallSample] = deque(maxlen=history)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._last = float("-inf")
+
+    @property
+    def history(self) -> List[RecallSample]:
+        """The kept comparisons, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def observe(
+        self,
+        embedding: Union[ndarray, List[float]],
+        result: SearchResult,
+        filter: Optional[Filter] = None,
+    ) -> Optional[RecallSample]:
+        """Maybe compare `result`, found by searching for `embedding` with the
+        distance and at least the `top_k` of the monitor, to the exact search.
+
+        Returns the comparison, None when the call is not sampled.
+        """
+        if not self._due():
+            return None
+        return self._compare(embedding, result, filter)
+
+    def check(
+        self,
+        queries: Iterable[Union[ndarray, List[float]]],
+        filter: Optional[Filter] = None,
+        search_option: Optional[SearchOption] = None,
+    ) -> List[RecallSample]:
+        """Search for each of `queries` with the vector indexes and exactly, and
+        compare them.
+        """
+        samples = []
+        for embedding in queries:
+            result = self.client.search(
+                embedding,
+                self.distance_op,
+                self.top_k,
+                filter,
+                search_option,
+                ids_only=True,
+            )
+            samples.append(self._compare(embedding, result, filter))
+        return samples
+
+    def summary(self, since: Optional[float] = None) -> RecallSummary:
+        """Aggregate the comparisons kept, only those made after the timestamp
+        `since` if given.
+        """
+        samples = [s for s in self.history if since is None or s.timestamp >= since]
+        if not samples:
+            return RecallSummary(0, float("nan"), float("nan"), float("nan"))
+        recalls = [s.recall for s in samples]
+        return RecallSummary(
+            len(samples),
+            float(np.mean(recalls)),
+            min(recalls),
+            float(np.mean([s.distance_error for s in samples])),
+        )
+
+    def _due(self) -> bool:
+        if self._random.random() >= self.sample_rate:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last < self.min_interval:
+                return False
+            self._last = now
+        return True
+
+    def _compare(
+        self,
+        embedding: Union[ndarray, List[float]],
+        result: SearchResult,
+        filter: Optional[Filter],
+    ) -> RecallSample:
+        start = time.perf_counter()
+        exact = self._exact_search(embedding, filter)
+        exact_seconds = time.perf_counter() - start
+        found = result[: self.top_k]
+        n = min(len(found), len(exact))
+        sample = RecallSample(
+            time.time(),
+            recall(found.ids, exact.ids),
+            float(np.mean(found.distances[:n] - exact.distances[:n])) if n else 0.0,
+            exact_seconds,
+        )
+        with self._lock:
+            self._history.append(sample)
+        return sample
+
+    def _exact_search(
+        self, embedding: Union[ndarray, List[float]], filter: Optional[Filter]
+    ) -> SearchResult:
+        table = self.client._table
+        columns = _projection(table, None, None, True)
+        stmt = _search_stmt(
+            table, columns, embedding, self.distance_op, self.top_k, filter
+        )
+        with Session(self.client._engine) as session:
+            apply_settings(session, _EXACT_SETTINGS)
+            rows = session.execute(stmt).all()
+        return SearchResult.from_rows(rows, [c.name for c in columns], 0)
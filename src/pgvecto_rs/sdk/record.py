@@ -4,7 +4,7 @@ from typing import List, Optional, Type, Union
 from uuid import UUID, uuid4
 
 from numpy import array, float32, ndarray
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Row, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped
 
 
@@ -18,15 +18,22 @@ class Unique:
     def __init__(self, columns: List[Column]):
         self.value = reduce(lambda x, y: x | y, columns)
 
-    def make(self) -> UniqueConstraint:
-        ans: List[UniqueConstraint] = []
+    @classmethod
+    def from_value(cls, value: int) -> "Unique":
+        return cls([column for column in Column if value & column])
+
+    def columns(self) -> List[str]:
+        ans: List[str] = []
         if self.value & Column.TEXT:
             ans.append("text")
         if self.value & Column.META:
             ans.append("meta")
         if self.value & Column.EMBEDDING:
             ans.append("embedding")
-        return UniqueConstraint(*ans)
+        return ans
+
+    def make(self) -> UniqueConstraint:
+        return UniqueConstraint(*self.columns())
 
 
 class RecordORM(DeclarativeBase):
@@ -41,6 +48,8 @@ RecordORMType = Type[RecordORM]
 
 
 class Record:
+    __slots__ = ("embedding", "id", "meta", "text")
+
     id: UUID
     text: str
     meta: dict
@@ -64,6 +73,17 @@ class Record:
     def from_orm(cls, orm: RecordORM):
         return cls(orm.id, orm.text, orm.meta, orm.embedding)
 
+    @classmethod
+    def from_row(cls, row: Row):
+        # columns left out of the select are None
+        mapping = row._mapping
+        return cls(
+            mapping["id"],
+            mapping.get("text"),
+            mapping.get("meta"),
+            mapping.get("embedding"),
+        )
+
     @classmethod
     def from_text(
         cls,
@@ -0,0 +1,183 @@
+import json
+from typing import (
+    Any,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+from uuid import UUID
+
+import numpy as np
+from numpy import ndarray
+from sqlalchemy import Row
+
+from pgvecto_rs.sdk.record import Record
+from pgvecto_rs.types import Vector
+
+
+class RecordBatch:
+    """Records held column by column.
+
+    `embeddings` is a float32 matrix with one row per record, ready for
+    vectorized processing. Columns that were not read are None. Iterating yields
+    the records.
+    """
+
+    __slots__ = ("embeddings", "ids", "metas", "texts")
+
+    def __init__(
+        self,
+        ids: List[UUID],
+        texts: Optional[List[str]] = None,
+        metas: Optional[List[dict]] = None,
+        embeddings: Optional[ndarray] = None,
+    ):
+        self.ids = ids
+        self.texts = texts
+        self.metas = metas
+        self.embeddings = embeddings
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Row], columns: Sequence[str], dimension: int
+    ) -> "RecordBatch":
+        """Build from rows of (id, *columns)."""
+        return cls(*_columns(rows, columns, dimension))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Record]:
+        for i in range(len(self.ids)):
+            yield self.record(i)
+
+    def __repr__(self) -> str:
+        return f"RecordBatch({self.ids})"
+
+    def record(self, index: int) -> Record:
+        return Record(
+            self.ids[index],
+            None if self.texts is None else self.texts[index],
+            None if self.metas is None else self.metas[index],
+            None if self.embeddings is None else Vector(self.embeddings[index]),
+        )
+
+    def records(self) -> List[Record]:
+        return list(RecordBatch.__iter__(self))
+
+    def _slice(self, index: slice) -> Tuple:
+        return (
+            self.ids[index],
+            None if self.texts is None else self.texts[index],
+            None if self.metas is None else self.metas[index],
+            None if self.embeddings is None else self.embeddings[index],
+        )
+
+
+class SearchPlan(NamedTuple):
+    """Plan and timing of a search, from `EXPLAIN (ANALYZE, BUFFERS)`."""
+
+    # the root node of the plan, as in EXPLAIN (FORMAT JSON)
+    plan: dict
+    planning_ms: float
+    execution_ms: float
+    # the vector index scanned in distance order, None if none is
+    index: Optional[str]
+
+    @classmethod
+    def from_explain(cls, value: Any) -> "SearchPlan":
+        if isinstance(value, str):
+            value = json.loads(value)
+        explain = value[0]
+        return cls(
+            explain["Plan"],
+            explain.get("Planning Time", 0.0),
+            explain.get("Execution Time", 0.0),
+            _ordered_index(explain["Plan"]),
+        )
+
+    @property
+    def uses_index(self) -> bool:
+        return self.index is not None
+
+
+def _ordered_index(node: dict) -> Optional[str]:
+    # a KNN search served by an index is an index scan ordered by the distance
+    if "Order By" in node and "Index Name" in node:
+        return node["Index Name"]
+    for child in node.get("Plans", ()):
+        index = _ordered_index(child)
+        if index is not None:
+            return index
+    return None
+
+
+class SearchResult(RecordBatch):
+    """Records found by a search, held column by column.
+
+    `distances` is a float32 array, the other columns are those of
+    `RecordBatch`. Iterating yields `(Record, distance)` tuples like a list of
+    results does. `plan` is set by `search(..., explain=True)`.
+    """
+
+    __slots__ = ("distances", "plan")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ids: List[UUID],
+        distances: ndarray,
+        texts: Optional[List[str]] = None,
+        metas: Optional[List[dict]] = None,
+        embeddings: Optional[ndarray] = None,
+    ):
+        super().__init__(ids, texts, metas, embeddings)
+        self.distances = distances
+        self.plan: Optional[SearchPlan] = None
+
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Row], columns: Sequence[str], dimension: int
+    ) -> "SearchResult":
+        """Build from rows of (id, *columns, distance)."""
+        ids, texts, metas, embeddings = _columns(rows, columns, dimension)
+        distances = np.fromiter((row.distance for row in rows), np.float32, len(rows))
+        return cls(ids, distances, texts, metas, embeddings)
+
+    def __iter__(self) -> Iterator[Tuple[Record, float]]:
+        for i in range(len(self.ids)):
+            yield self[i]
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[Record, float]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SearchResult":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            ids, texts, metas, embeddings = self._slice(index)
+            return SearchResult(ids, self.distances[index], texts, metas, embeddings)
+        return self.record(index), float(self.distances[index])
+
+    def __repr__(self) -> str:
+        return f"SearchResult({list(zip(self.ids, self.distances.tolist()))})"
+
+
+def _columns(rows: Sequence[Row], columns: Sequence[str], dimension: int) -> Tuple:
+    texts = metas = embeddings = None
+    if "text" in columns:
+        texts = [row.text for row in rows]
+    if "meta" in columns:
+        metas = [row.meta for row in rows]
+    if "embedding" in columns:
+        embeddings = np.empty((len(rows), dimension), dtype=np.float32)
+        for i, row in enumerate(rows):
+            embeddings[i] = row.embedding.to_numpy()
+    return [row.id for row in rows], texts, metas, embeddings
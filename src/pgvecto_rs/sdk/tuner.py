@@ -0,0 +1,170 @@
+import time
+from typing import List, NamedTuple, Optional, Sequence
+from uuid import uuid4
+
+import numpy as np
+from numpy import ndarray
+from sqlalchemy import func, select, tablesample
+from sqlalchemy.orm.session import Session
+
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.sdk.client import (
+    DistanceOp,
+    PGVectoRs,
+    _row_count_stmt,
+    _vector_type,
+)
+from pgvecto_rs.sdk.metrics import exact_neighbors, recall
+from pgvecto_rs.types import Hnsw, IndexOption, Ivf, Quantization, SearchOption
+from pgvecto_rs.utils import sample_percent
+
+
+class Trial(NamedTuple):
+    """Measures of an index built on the sampled rows."""
+
+    option: IndexOption
+    # mean recall@k of the searches against the exact nearest neighbors
+    recall: float
+    # latencies of the searches in seconds
+    p50: float
+    p99: float
+    build_seconds: float
+    index_bytes: int
+
+
+class TuningReport(NamedTuple):
+    # the cheapest trial meeting the target recall, None if none does
+    best: Optional[Trial]
+    # the trials, cheapest first
+    trials: List[Trial]
+
+
+def default_candidates(rows: int) -> List[IndexOption]:
+    """Index options tried by `tune_index` for a table of `rows` rows."""
+    nlist = max(1, int(np.sqrt(rows)))
+    return [
+        IndexOption(Ivf(nlist=nlist)),
+        IndexOption(Ivf(nlist=nlist, quantization=Quantization("scalar"))),
+        IndexOption(Hnsw(m=8, ef_construction=100)),
+        IndexOption(Hnsw(m=16, ef_construction=200)),
+        IndexOption(
+            Hnsw(m=16, ef_construction=200, quantization=Quantization("scalar"))
+        ),
+        IndexOption(Hnsw(m=32, ef_construction=400)),
+    ]
+
+
+def tune_index(  # noqa: PLR0913
+    client: PGVectoRs,
+    target_recall: float = 0.95,
+    candidates: Optional[Sequence[IndexOption]] = None,
+    distance_op: DistanceOp = "<->",
+    sample_rows: int = 10000,
+    queries: int = 100,
+    top_k: int = 10,
+    search_option: Optional[SearchOption] = None,
+) -> TuningReport:
+    """Recommend the cheapest index option of the collection of `client` that
+    reaches `target_recall`.
+
+    Rows sampled from the collection with `TABLESAMPLE` are copied to a scratch
+    collection with a unique name, dropped afterwards. `queries` of them are
+    held out as queries and their exact nearest neighbors are computed
+    client-side. Each candidate is then built on the scratch collection and
+    measured. Trials are ranked by index size, then by p99 latency and build
+    time.
+
+    Args:
+    ----
+        client (PGVectoRs): the collection to tune an index for.
+        target_recall (float): recall@k the recommended option must reach.
+        candidates (List[IndexOption]): options to try, `default_candidates`
+            if None.
+        distance_op (str): the distance the index serves.
+        sample_rows (int): rows sampled from the collection, queries included.
+        queries (int): sampled rows searched for.
+        top_k (int): k of recall@k.
+        search_option (SearchOption): options of the measured searches.
+
+    """
+    sample = _sample(client, sample_rows)
+    if len(sample) <= queries:
+        raise OptionValueError(
+            "sample_rows", sample_rows, f"more than the {queries} queries sampled"
+        )
+    data, held_out = sample[:-queries], sample[-queries:]
+    if candidates is None:
+        candidates = default_candidates(len(data))
+
+    # a unique name, so that neither user tables nor concurrent tuners are dropped
+    name = client._table.name[len("collection_") :]
+    scratch = PGVectoRs(
+        client._engine,
+        collection_name=f"{name}_tuner_{uuid4().hex[:8]}",
+        dimension=client.dimension,
+        vector_type=_vector_type(client._table),
+    )
+    try:
+        ids = scratch.insert_array(data, [""] * len(data))
+        truth = [
+            [ids[i] for i in row]
+            for row in exact_neighbors(data, held_out, distance_op, top_k)
+        ]
+        trials = [
+            _trial(scratch, option, distance_op, held_out, truth, top_k, search_option)
+            for option in candidates
+        ]
+    finally:
+        scratch.drop()
+    trials.sort(key=lambda t: (t.index_bytes, t.p99, t.build_seconds))
+    best = next((t for t in trials if t.recall >= target_recall), None)
+    return TuningReport(best, trials)
+
+
+def _sample(client: PGVectoRs, rows: int) -> ndarray:
+    table = client._table
+    with Session(client._engine) as session:
+        count = session.execute(_row_count_stmt(table, True, None)).scalar_one()
+        sampled = tablesample(table, func.system(sample_percent(count or 0, rows)))
+        stmt = select(sampled.c.embedding).limit(rows)
+        embeddings = session.execute(stmt).scalars().all()
+    matrix = np.empty((len(embeddings), client.dimension), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        matrix[i] = embedding.to_numpy()
+    return matrix
+
+
+def _trial(  # noqa: PLR0913
+    scratch: PGVectoRs,
+    option: IndexOption,
+    distance_op: DistanceOp,
+    queries: ndarray,
+    truth: List[list],
+    top_k: int,
+    search_option: Optional[SearchOption],
+) -> Trial:
+    start = time.perf_counter()
+    index = scratch.create_index(option, distance_op, concurrently=False)
+    stats = scratch.wait_for_index(index, poll_interval=0.05)
+    build_seconds = time.perf_counter() - start
+    try:
+        latencies = []
+        recalls = []
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            result = scratch.search(
+                query, distance_op, top_k, search_option=search_option, ids_only=True
+            )
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall(result.ids, expected))
+    finally:
+        scratch.drop_index(index, concurrently=False)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return Trial(
+        option,
+        float(np.mean(recalls)),
+        float(p50),
+        float(p99),
+        build_seconds,
+        stats.size,
+    )
@@ -1,4 +1,7 @@
+from .bulk import bulk_insert
 from .bvector import BVECTOR
+from .index import VectorIndex, opclass_for
+from .search import search_option, set_search_option
 from .svector import SVECTOR
 from .vecf16 import VECF16
 from .vector import VECTOR
@@ -8,4 +11,9 @@ __all__ = [
     "SVECTOR",
     "VECF16",
     "VECTOR",
+    "VectorIndex",
+    "bulk_insert",
+    "opclass_for",
+    "search_option",
+    "set_search_option",
 ]
@@ -0,0 +1,261 @@
+import json
+import re
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import Connection, Table, insert, types
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from pgvecto_rs.errors import (
+    BatchLengthError,
+    MatrixDimensionError,
+    ToDBDimUnequalError,
+    TypeNotFoundError,
+)
+from pgvecto_rs.types import BinaryVector, Float16Vector, SparseVector, Vector
+
+from .bvector import BVECTOR
+from .vecf16 import VECF16
+from .vector import VECTOR
+
+# dtype of the rows handed to the codec of each column type
+_ROW_DTYPES = {VECTOR: "<f4", VECF16: "<f2", BVECTOR: bool}
+_PG_VECTOR_TYPES = {
+    "vector": Vector,
+    "vecf16": Float16Vector,
+    "bvector": BinaryVector,
+    "svector": SparseVector,
+}
+# "VARCHAR(20)" -> "varchar", "VECTOR(3)" -> "vector"
+_TYPE_MODIFIER = re.compile(r"\(.*?\)")
+_ASYNCPG_REGISTERED = "pgvecto_rs_asyncpg_codecs"
+
+
+def bulk_insert(  # noqa: PLR0913
+    bind: Union[Connection, Session],
+    table: Any,
+    embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+    columns: Optional[Dict[str, Sequence[Any]]] = None,
+    embedding_column: str = "embedding",
+    batch_size: int = 1000,
+) -> int:
+    """Insert a 2-D matrix of embeddings, one row per matrix row.
+
+    The fastest path of the driver is used: binary COPY on psycopg,
+    `copy_records_to_table` on asyncpg and batched `executemany` otherwise.
+    Like `execute`, the rows are written in the current transaction, the caller
+    is responsible for the commit.
+
+    Args:
+    ----
+        bind: connection or session to insert with.
+        table: `Table` or ORM class to insert into.
+        embeddings: 2-D array, one embedding per row.
+        columns: values of the other columns, each as long as `embeddings`.
+        embedding_column: name of the vector column. Defaults to "embedding".
+        batch_size: rows per statement for the `executemany` path.
+
+    Returns:
+    -------
+        Number of inserted rows.
+
+    """
+    if isinstance(bind, Session):
+        bind = bind.connection()
+    elif not bind.in_transaction():
+        bind.begin()
+    table = getattr(table, "__table__", table)
+    columns = columns or {}
+
+    matrix = _as_matrix(embeddings, table.c[embedding_column].type)
+    length = matrix.shape[0]
+    for name, values in columns.items():
+        if len(values) != length:
+            raise BatchLengthError(name, length, len(values))
+    names = [embedding_column, *columns.keys()]
+    rows = zip(matrix, *columns.values())
+
+    driver = bind.dialect.driver
+    if driver == "psycopg":
+        with _wrap_errors(bind, table):
+            _copy_psycopg(bind, table, names, rows)
+    elif driver == "asyncpg":
+        with _wrap_errors(bind, table):
+            _copy_asyncpg(bind, table, names, rows)
+    else:
+        _insert_many(bind, table, names, rows, batch_size)
+    return length
+
+
+@contextmanager
+def _wrap_errors(conn: Connection, table: Table):
+    # COPY runs on the driver connection, raise the same exceptions as `execute`
+    dbapi = conn.dialect.loaded_dbapi
+    statement = f"COPY {table.name}"
+    try:
+        yield
+    except dbapi.Error as err:
+        raise DBAPIError.instance(
+            statement, None, err, dbapi.Error, dialect=conn.dialect
+        ) from err
+
+
+def _as_matrix(embeddings, column_type) -> np.ndarray:
+    matrix = np.asarray(embeddings, dtype=_ROW_DTYPES.get(type(column_type)))
+    if matrix.ndim != 2:  # noqa: PLR2004
+        raise MatrixDimensionError(matrix.ndim)
+    dim = getattr(column_type, "dim", None)
+    if dim and matrix.shape[1] != dim:
+        raise ToDBDimUnequalError(dim, matrix.shape[1])
+    return matrix
+
+
+def _type_name(table: Table, name: str, dialect: Dialect) -> str:
+    return _TYPE_MODIFIER.sub("", table.c[name].type.compile(dialect=dialect)).lower()
+
+
+def _insert_many(
+    conn: Connection,
+    table: Table,
+    names: List[str],
+    rows: Iterator[Tuple],
+    batch_size: int,
+) -> None:
+    stmt = insert(table)
+    while True:
+        batch = [dict(zip(names, row)) for row in islice(rows, batch_size)]
+        if not batch:
+            return
+        conn.execute(stmt, batch)
+
+
+def _copy_psycopg(
+    conn: Connection, table: Table, names: List[str], rows: Iterator[Tuple]
+) -> None:
+    from psycopg import sql
+
+    driver_conn = conn.connection.driver_connection
+    pg_types = [_type_name(table, name, conn.dialect) for name in names]
+    stmt = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT BINARY)").format(
+        sql.Identifier(*filter(None, (table.schema, table.name))),
+        sql.SQL(", ").join(map(sql.Identifier, names)),
+    )
+    if conn.dialect.is_async:
+        await_only(_copy_psycopg_async(driver_conn, stmt, pg_types, rows))
+        return
+
+    from psycopg.types import TypeInfo
+
+    for typname in pg_types:
+        if (
+            typname in _PG_VECTOR_TYPES
+            and driver_conn.adapters.types.get(typname) is None
+        ):
+            _register_psycopg(
+                driver_conn, typname, TypeInfo.fetch(driver_conn, typname)
+            )
+    with driver_conn.cursor() as cursor, cursor.copy(stmt) as copy:
+        copy.set_types(pg_types)
+        for row in rows:
+            copy.write_row(row)
+
+
+async def _copy_psycopg_async(driver_conn, stmt, pg_types, rows) -> None:
+    from psycopg.types import TypeInfo
+
+    for typname in pg_types:
+        if (
+            typname in _PG_VECTOR_TYPES
+            and driver_conn.adapters.types.get(typname) is None
+        ):
+            info = await TypeInfo.fetch(driver_conn, typname)
+            _register_psycopg(driver_conn, typname, info)
+    async with driver_conn.cursor() as cursor, cursor.copy(stmt) as copy:
+        copy.set_types(pg_types)
+        for row in rows:
+            await copy.write_row(row)
+
+
+def _register_psycopg(context, typname: str, info) -> None:
+    # Only the binary dumper of our own class is registered, so that the
+    # dumpers of list and ndarray used by SQLAlchemy stay untouched.
+    from pgvecto_rs.psycopg.bvector import BinaryVectorBinaryDumper
+    from pgvecto_rs.psycopg.svector import SparseVectorBinaryDumper
+    from pgvecto_rs.psycopg.vecf16 import Float16VectorBinaryDumper
+    from pgvecto_rs.psycopg.vector import VectorBinaryDumper
+
+    dumpers = {
+        "vector": VectorBinaryDumper,
+        "vecf16": Float16VectorBinaryDumper,
+        "bvector": BinaryVectorBinaryDumper,
+        "svector": SparseVectorBinaryDumper,
+    }
+    if info is None:
+        raise TypeNotFoundError(typname)
+    info.register(context)
+    dumper = type("", (dumpers[typname],), {"oid": info.oid})
+    context.adapters.register_dumper(_PG_VECTOR_TYPES[typname], dumper)
+
+
+def _copy_asyncpg(
+    conn: Connection, table: Table, names: List[str], rows: Iterator[Tuple]
+) -> None:
+    pooled = conn.connection
+    driver_conn = pooled.driver_connection
+    if not pooled.info.get(_ASYNCPG_REGISTERED):
+        await_only(_register_asyncpg(driver_conn))
+        pooled.info[_ASYNCPG_REGISTERED] = True
+
+    # the JSON codecs installed by SQLAlchemy expect serialized documents
+    is_json = [isinstance(table.c[name].type, types.JSON) for name in names]
+    records = [
+        tuple(
+            json.dumps(value) if serialize and value is not None else value
+            for value, serialize in zip(row, is_json)
+        )
+        for row in rows
+    ]
+    try:
+        await_only(
+            driver_conn.copy_records_to_table(
+                table.name,
+                records=records,
+                columns=names,
+                schema_name=table.schema,
+            )
+        )
+    except Exception as err:
+        # translate the asyncpg exception into its DBAPI counterpart
+        pooled.dbapi_connection._handle_exception(err)
+
+
+async def _register_asyncpg(driver_conn) -> None:
+    for typname, cls in _PG_VECTOR_TYPES.items():
+        schema = await driver_conn.fetchval(
+            "SELECT typnamespace::regnamespace::text FROM pg_type WHERE typname = $1",
+            typname,
+        )
+        if schema is None:
+            continue
+        await driver_conn.set_type_codec(
+            typname,
+            schema=schema,
+            encoder=_asyncpg_encoder(cls),
+            decoder=cls._from_db_binary,
+            format="binary",
+        )
+
+
+def _asyncpg_encoder(cls):
+    # SQLAlchemy binds vectors as text, COPY hands over arrays
+    def _encoder(value):
+        if isinstance(value, str):
+            value = cls._from_db(value)
+        return cls._to_db_binary(value)
+
+    return _encoder
@@ -0,0 +1,70 @@
+from typing import Any, Optional, Union
+
+from sqlalchemy import Index
+
+from pgvecto_rs.errors import OpclassNotFoundError
+from pgvecto_rs.types import Flat, Hnsw, IndexOption, Ivf
+
+from .bvector import BVECTOR
+from .svector import SVECTOR
+from .vecf16 import VECF16
+from .vector import VECTOR
+
+_OPCLASS_TYPES = {
+    VECTOR: "vector",
+    VECF16: "vecf16",
+    BVECTOR: "bvector",
+    SVECTOR: "svector",
+}
+_OPCLASS_DISTANCES = {
+    "<->": "l2",
+    "<#>": "dot",
+    "<=>": "cos",
+    "<~>": "jaccard",
+}
+
+
+def opclass_for(column_type: Any, distance_op: str = "<->") -> str:
+    """Return the operator class indexing `column_type` for `distance_op`,
+    e.g. `vecf16_cos_ops` for a `VECF16` column searched with `<=>`.
+    """
+    prefix = _OPCLASS_TYPES.get(type(column_type))
+    distance = _OPCLASS_DISTANCES.get(distance_op)
+    if prefix is None or distance is None:
+        raise OpclassNotFoundError(column_type, distance_op)
+    return f"{prefix}_{distance}_ops"
+
+
+class VectorIndex(Index):
+    """A `vectors` index, configured by an `IndexOption`.
+
+    With `concurrently=True` the index is built with `CREATE INDEX CONCURRENTLY`,
+    which must run outside of a transaction, e.g. on a connection with
+    `execution_options(isolation_level="AUTOCOMMIT")`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: Optional[str],
+        expression: Any,
+        option: Union[IndexOption, Hnsw, Ivf, Flat],
+        opclass: Optional[str] = None,
+        distance_op: str = "<->",
+        concurrently: bool = False,
+        **kwargs,
+    ):
+        if not isinstance(option, IndexOption):
+            option = IndexOption(index=option)
+        if opclass is None:
+            opclass = opclass_for(getattr(expression, "type", None), distance_op)
+        key = expression if isinstance(expression, str) else expression.key
+        self.option = option
+        super().__init__(
+            name,
+            expression,
+            postgresql_using="vectors",
+            postgresql_with={"options": f"$${option.dumps()}$$"},
+            postgresql_ops={key: opclass},
+            postgresql_concurrently=concurrently,
+            **kwargs,
+        )
@@ -0,0 +1,64 @@
+from contextlib import contextmanager, suppress
+from typing import Dict, Iterator, Optional, Union
+
+from sqlalchemy import Connection, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from pgvecto_rs.types import SearchOption
+
+
+def set_search_option(
+    bind: Union[Connection, Session], option: SearchOption
+) -> Dict[str, Optional[str]]:
+    """Apply the settings of `option` to the current transaction.
+
+    All settings are sent in a single statement. The values they replace are
+    returned, so that they can be restored later.
+    """
+    return apply_settings(bind, option.dump())
+
+
+def apply_settings(
+    bind: Union[Connection, Session], settings: Dict[str, Optional[str]]
+) -> Dict[str, Optional[str]]:
+    """Run `set_config(name, value, true)` for each setting in one statement.
+
+    A value of None resets the setting to its session default.
+    """
+    if not settings:
+        return {}
+    columns = []
+    for name, value in settings.items():
+        columns.append(func.current_setting(name, True))
+        columns.append(func.set_config(name, value, True))
+    row = bind.execute(select(*columns)).one()
+    return dict(zip(settings.keys(), row[::2]))
+
+
+@contextmanager
+def search_option(
+    bind: Union[Connection, Session], option: SearchOption
+) -> Iterator[None]:
+    """Tune the searches executed inside the block.
+
+    The settings are local to the transaction of `bind`, and the previous values
+    are restored on exit, even if the block raises.
+    """
+    previous = set_search_option(bind, option)
+    try:
+        yield
+    except BaseException:
+        # the block may have aborted the transaction, whose rollback ends the
+        # settings anyway
+        with suppress(SQLAlchemyError):
+            _restore(bind, previous)
+        raise
+    _restore(bind, previous)
+
+
+def _restore(
+    bind: Union[Connection, Session], previous: Dict[str, Optional[str]]
+) -> None:
+    if bind.in_transaction():
+        apply_settings(bind, previous)
@@ -1,5 +1,6 @@
 from .bvector import BinaryVector
-from .index import Flat, Hnsw, IndexOption, Ivf, Quantization
+from .index import Flat, Hnsw, IndexOption, Ivf, Optimizing, Quantization, Segment
+from .search import SearchOption
 from .svector import SparseVector
 from .vecf16 import Float16Vector
 from .vector import Vector
@@ -14,4 +15,7 @@ __all__ = [
     "Ivf",
     "Flat",
     "IndexOption",
+    "Optimizing",
+    "Segment",
+    "SearchOption",
 ]
@@ -1,12 +1,26 @@
 # TODO: remove after Python < 3.9 is no longer used
 from __future__ import annotations
 
+import re
 from typing import Any, Literal, Optional, Union
 
 import toml
 
+from pgvecto_rs.errors import OptionValueError
+
 QuantizationType = Literal["trivial", "scalar", "product"]
 QuantizationRatio = Literal["x4", "x8", "x16", "x32", "x64"]
+# the options of an index definition, e.g. from pg_get_indexdef or `\d+`
+_DEFINITION_OPTIONS = re.compile(
+    r"options\s*=\s*(?:'((?:[^']|'')*)'|\$\$(.*?)\$\$)", re.S
+)
+_DEFINITION = re.compile(r"\s*CREATE\s+(?:UNIQUE\s+)?INDEX\b", re.I)
+_SEGMENT_SIZE = 4_000_000_000
+
+
+def _check(name: str, value: Optional[float], low: float, high: float) -> None:
+    if value is not None and not low <= value <= high:
+        raise OptionValueError(name, value, f"a number in [{low}, {high}]")
 
 
 class Quantization:
@@ -26,6 +40,13 @@ class Quantization:
         else:
             return {}
 
+    @classmethod
+    def load(cls, option: dict) -> Optional[Quantization]:
+        if not option:
+            return None
+        typ, child = next(iter(option.items()))
+        return cls(typ, child.get("ratio"))
+
 
 class Flat:
     def __init__(self, quantization: Optional[Quantization] = None):
@@ -37,6 +58,10 @@ class Flat:
             child.update(self.quantization.dump())
         return {"flat": child}
 
+    @classmethod
+    def load(cls, option: dict) -> Flat:
+        return cls(Quantization.load(option.get("quantization", {})))
+
 
 class Hnsw:
     def __init__(
@@ -59,13 +84,36 @@ class Hnsw:
             child.update({"ef_construction": self.ef_construction})
         return {"hnsw": child}
 
+    @classmethod
+    def load(cls, option: dict) -> Hnsw:
+        return cls(
+            option.get("m"),
+            option.get("ef_construction"),
+            Quantization.load(option.get("quantization", {})),
+        )
+
 
 class Ivf:
-    def __init__(
-        self, nlist: Optional[int] = None, quantization: Optional[Quantization] = None
+    """IVF index options, `nsample`, `least_iterations` and `iterations` tune
+    the k-means training of the `nlist` centroids.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        nlist: Optional[int] = None,
+        quantization: Optional[Quantization] = None,
+        nsample: Optional[int] = None,
+        least_iterations: Optional[int] = None,
+        iterations: Optional[int] = None,
     ):
+        _check("nsample", nsample, 1, 1_000_000)
+        _check("least_iterations", least_iterations, 1, 1_000_000)
+        _check("iterations", iterations, 1, 1_000_000)
         self.nlist = nlist
         self.quantization = quantization
+        self.nsample = nsample
+        self.least_iterations = least_iterations
+        self.iterations = iterations
 
     def dump(self) -> dict:
         child: dict[str, Any] = {}
@@ -73,23 +121,161 @@ class Ivf:
             child.update(self.quantization.dump())
         if self.nlist is not None:
             child.update({"nlist": self.nlist})
+        for key in ("nsample", "least_iterations", "iterations"):
+            if getattr(self, key) is not None:
+                child[key] = getattr(self, key)
         return {"ivf": child}
 
+    @classmethod
+    def load(cls, option: dict) -> Ivf:
+        return cls(
+            option.get("nlist"),
+            Quantization.load(option.get("quantization", {})),
+            option.get("nsample"),
+            option.get("least_iterations"),
+            option.get("iterations"),
+        )
+
+
+class Segment:
+    """Sizes of the segments of an index: rows are written to a growing
+    segment, which is sealed and indexed once it holds
+    `max_growing_segment_size` rows, and sealed segments are merged up to
+    `max_sealed_segment_size` rows.
+    """
+
+    def __init__(
+        self,
+        max_growing_segment_size: Optional[int] = None,
+        max_sealed_segment_size: Optional[int] = None,
+    ):
+        _check("max_growing_segment_size", max_growing_segment_size, 1, _SEGMENT_SIZE)
+        _check("max_sealed_segment_size", max_sealed_segment_size, 1, _SEGMENT_SIZE)
+        self.max_growing_segment_size = max_growing_segment_size
+        self.max_sealed_segment_size = max_sealed_segment_size
+
+    def dump(self) -> dict:
+        return {
+            key: getattr(self, key)
+            for key in ("max_growing_segment_size", "max_sealed_segment_size")
+            if getattr(self, key) is not None
+        }
+
+    @classmethod
+    def load(cls, option: dict) -> Segment:
+        return cls(
+            option.get("max_growing_segment_size"),
+            option.get("max_sealed_segment_size"),
+        )
+
+
+class Optimizing:
+    """Background optimizing of an index: a growing segment is sealed after
+    `sealing_secs` seconds without writes if it holds `sealing_size` rows, and
+    segments whose share of deleted rows exceeds `delete_threshold` are rebuilt.
+    """
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        sealing_secs: Optional[int] = None,
+        sealing_size: Optional[int] = None,
+        delete_threshold: Optional[float] = None,
+    ):
+        _check("threads", threads, 1, 65535)
+        _check("sealing_secs", sealing_secs, 1, 60)
+        _check("sealing_size", sealing_size, 1, _SEGMENT_SIZE)
+        _check("delete_threshold", delete_threshold, 0.01, 1.0)
+        self.threads = threads
+        self.sealing_secs = sealing_secs
+        self.sealing_size = sealing_size
+        self.delete_threshold = delete_threshold
+
+    def dump(self) -> dict:
+        child: dict[str, Any] = {}
+        if self.threads is not None:
+            child["optimizing_threads"] = self.threads
+        for key in ("sealing_secs", "sealing_size", "delete_threshold"):
+            if getattr(self, key) is not None:
+                child[key] = getattr(self, key)
+        return child
+
+    @classmethod
+    def load(cls, option: dict) -> Optimizing:
+        return cls(
+            option.get("optimizing_threads"),
+            option.get("sealing_secs"),
+            option.get("sealing_size"),
+            option.get("delete_threshold"),
+        )
+
 
 class IndexOption:
+    """Options of a `vectors` index, e.g. `WITH (options = $$...$$)`.
+
+    `threads` is a shortcut for `Optimizing(threads=...)`.
+    """
+
     def __init__(
         self,
         index: Union[Hnsw, Ivf, Flat],
         threads: Optional[int] = None,
+        segment: Optional[Segment] = None,
+        optimizing: Optional[Optimizing] = None,
     ):
+        if (
+            threads is not None
+            and optimizing is not None
+            and optimizing.threads not in (None, threads)
+        ):
+            raise OptionValueError("threads", threads, f"{optimizing.threads} or None")
         self.index = index
-        self.threads = threads
+        self.threads = (
+            threads if threads is not None else getattr(optimizing, "threads", None)
+        )
+        self.segment = segment
+        self.optimizing = optimizing
 
     def dump(self) -> dict:
         child: dict[str, Any] = {"indexing": self.index.dump()}
+        segment = self.segment.dump() if self.segment is not None else {}
+        if segment:
+            child["segment"] = segment
+        optimizing = self.optimizing.dump() if self.optimizing is not None else {}
         if self.threads is not None:
-            child["optimizing"] = {"optimizing_threads": self.threads}
+            optimizing["optimizing_threads"] = self.threads
+        if optimizing:
+            child["optimizing"] = optimizing
         return child
 
     def dumps(self) -> str:
         return toml.dumps(self.dump())
+
+    @classmethod
+    def load(cls, option: dict) -> IndexOption:
+        indexing = option.get("indexing", {"hnsw": {}})
+        typ, child = next(iter(indexing.items()))
+        loaders = {"flat": Flat.load, "hnsw": Hnsw.load, "ivf": Ivf.load}
+        if typ not in loaders:
+            raise OptionValueError("indexing", typ, "one of 'flat', 'hnsw', 'ivf'")
+        optimizing = Optimizing.load(option.get("optimizing", {}))
+        return cls(
+            loaders[typ](child),
+            optimizing.threads,
+            Segment.load(option.get("segment", {})),
+            optimizing,
+        )
+
+    @classmethod
+    def loads(cls, value: str) -> IndexOption:
+        """Parse the TOML options of an index, or the options of an index
+        definition, e.g. `CREATE INDEX ... WITH (options = '...')`. A definition
+        without options has the default ones.
+        """
+        match = _DEFINITION_OPTIONS.search(value)
+        if match is not None:
+            quoted, dollar_quoted = match.groups()
+            value = dollar_quoted if quoted is None else quoted.replace("''", "'")
+        elif _DEFINITION.match(value):
+            return cls.load({})
+        return cls.load(toml.loads(value))
@@ -0,0 +1,64 @@
+# TODO: remove after Python < 3.9 is no longer used
+from __future__ import annotations
+
+from typing import Dict, List, Literal, Optional, Tuple
+
+from pgvecto_rs.errors import OptionValueError
+
+SearchMode = Literal["basic", "vbase"]
+
+
+class SearchOption:
+    """Session settings of pgvecto.rs that tune a single search.
+
+    They are applied with `SET LOCAL` semantics, so they only last until the end
+    of the transaction running the search.
+    """
+
+    def __init__(
+        self,
+        ef_search: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        search_mode: Optional[SearchMode] = None,
+    ):
+        if ef_search is not None and not 1 <= ef_search <= 65535:  # noqa: PLR2004
+            raise OptionValueError("ef_search", ef_search, "an integer in [1, 65535]")
+        if nprobe is not None and not 1 <= nprobe <= 1_000_000:  # noqa: PLR2004
+            raise OptionValueError("nprobe", nprobe, "an integer in [1, 1000000]")
+        if search_mode is not None and search_mode not in ("basic", "vbase"):
+            raise OptionValueError("search_mode", search_mode, "'basic' or 'vbase'")
+        self.ef_search = ef_search
+        self.nprobe = nprobe
+        self.search_mode = search_mode
+
+    def dump(self) -> Dict[str, str]:
+        settings: Dict[str, str] = {}
+        if self.ef_search is not None:
+            settings["vectors.hnsw_ef_search"] = str(self.ef_search)
+        if self.nprobe is not None:
+            settings["vectors.ivf_nprobe"] = str(self.nprobe)
+        if self.search_mode is not None:
+            settings["vectors.search_mode"] = self.search_mode
+        return settings
+
+    def set_config_query(self) -> Optional[Tuple[str, List[Optional[str]]]]:
+        """A query applying the settings to the current transaction in one
+        statement and its parameters, see `set_config_query`.
+        """
+        return set_config_query(self.dump())
+
+
+def set_config_query(
+    settings: Dict[str, Optional[str]],
+) -> Optional[Tuple[str, List[Optional[str]]]]:
+    """A query running `set_config(name, value, true)` for each setting in one
+    statement and its parameters, in the `%s` style of psycopg and Django.
+
+    The values replaced are selected too, in the even columns, so that they can
+    be restored later. None if there is nothing to set.
+    """
+    if not settings:
+        return None
+    column = "current_setting(%s, true), set_config(%s, %s, true)"
+    query = "SELECT " + ", ".join([column] * len(settings))
+    return query, [v for name, value in settings.items() for v in (name, name, value)]
@@ -36,7 +36,7 @@ class SparseVector:
 
             self._from_dict(value, dimensions)
         else:
-            if not isinstance(dimensions, NO_DEFAULT):
+            if not isinstance(dimensions, NoDefault):
                 raise SparseExtraArgError(type(value), dimensions)
 
             self._from_dense(value)
@@ -139,7 +139,7 @@ class SparseVector:
 
     def _from_dense(self, value):
         self._dim = len(value)
-        self._indices = [i for i, v in enumerate(value) if np.isclose(v, 0)]
+        self._indices = [i for i, v in enumerate(value) if not np.isclose(v, 0)]
         self._values = [float(value[i]) for i in self._indices]
 
     @classmethod
@@ -0,0 +1,18 @@
+DISTANCE_OPS = ("<->", "<#>", "<=>", "<~>")
+HAS_PREWARM = "SELECT EXISTS (SELECT FROM pg_extension WHERE extname = 'pg_prewarm')"
+
+
+def sample_percent(rows: float, queries: int) -> float:
+    """Percentage of the pages of a table of `rows` rows read by `TABLESAMPLE
+    SYSTEM` to sample about `queries` rows.
+    """
+    # enough pages for about 4 times `queries` rows, all of them before ANALYZE
+    if rows <= 0:
+        return 100.0
+    return min(100.0, 400.0 * queries / rows)
+
+
+def to_numpy(embedding):
+    """`embedding` as an array if it is a `Vector`, `SparseVector`, etc."""
+    # embeddings read from the database are Vector objects
+    return embedding.to_numpy() if hasattr(embedding, "to_numpy") else embedding
@@ -11,7 +11,10 @@ from pgvecto_rs.types import (
     Hnsw,
     IndexOption,
     Ivf,
+    Optimizing,
     Quantization,
+    SearchOption,
+    Segment,
     SparseVector,
     Vector,
 )
@@ -74,6 +77,8 @@ EQUAL_SPARSE_VECTORS = [
     ),
     SparseVector(COO_COMPACT_1),
     SparseVector.from_parts(6, [1, 3, 5], [2, 4, 6]),
+    SparseVector([0, 2, 0, 4, 0, 6]),
+    SparseVector(np.array([0, 2, 0, 4, 0, 6], dtype=np.float32)),
 ]
 
 EQUAL_VECTORS = [
@@ -122,6 +127,54 @@ INDEX_OPTION_DUMPS = [
         ),
         '[indexing.hnsw]\nm = 1\nef_construction = 2\n\n[indexing.hnsw.quantization.product]\nratio = "x4"\n',
     ),
+    (
+        IndexOption(
+            index=Ivf(nlist=100, nsample=1000, least_iterations=4, iterations=20),
+            segment=Segment(max_growing_segment_size=100_000),
+            optimizing=Optimizing(threads=4, sealing_secs=10, delete_threshold=0.5),
+        ),
+        "[segment]\nmax_growing_segment_size = 100000\n\n"
+        "[optimizing]\noptimizing_threads = 4\nsealing_secs = 10\ndelete_threshold = 0.5\n\n"
+        "[indexing.ivf]\nnlist = 100\nnsample = 1000\nleast_iterations = 4\niterations = 20\n",
+    ),
+]
+INDEX_OPTION_DEFINITIONS = [
+    (
+        "CREATE INDEX emb_idx ON public.items USING vectors (embedding vector_l2_ops) "
+        "WITH (options='[indexing.hnsw]\nm = 16\n')",
+        "[indexing.hnsw]\nm = 16\n",
+    ),
+    (
+        "CREATE INDEX ON items USING vectors (embedding vector_l2_ops) "
+        "WITH (options = $$[optimizing]\noptimizing_threads = 2\n[indexing.flat]$$)",
+        "[optimizing]\noptimizing_threads = 2\n\n[indexing.flat]\n",
+    ),
+    # created without options
+    (
+        "CREATE INDEX emb_idx ON public.items USING vectors (embedding vector_l2_ops)",
+        "[indexing.hnsw]\n",
+    ),
+]
+INVALID_INDEX_OPTIONS = [
+    lambda: Ivf(nsample=0),
+    lambda: Segment(max_sealed_segment_size=0),
+    lambda: Optimizing(sealing_secs=61),
+    lambda: Optimizing(delete_threshold=2.0),
+    lambda: IndexOption(Hnsw(), threads=2, optimizing=Optimizing(threads=4)),
+    lambda: IndexOption.loads("[indexing.tree]\n"),
+]
+SEARCH_OPTION_DUMPS = [
+    (SearchOption(), {}),
+    (SearchOption(ef_search=64), {"vectors.hnsw_ef_search": "64"}),
+    (
+        SearchOption(nprobe=8, search_mode="vbase"),
+        {"vectors.ivf_nprobe": "8", "vectors.search_mode": "vbase"},
+    ),
+]
+INVALID_SEARCH_OPTIONS = [
+    {"ef_search": 0},
+    {"nprobe": 1_000_001},
+    {"search_mode": "fast"},
 ]
 # ==== test_create_index ====
 
@@ -2,7 +2,7 @@ import django
 import numpy as np
 import pytest
 from django.conf import settings
-from django.db import connection, migrations, models
+from django.db import connection, migrations, models, transaction
 from django.db.backends.utils import CursorWrapper
 from django.forms import ModelForm
 
@@ -12,14 +12,17 @@ from pgvecto_rs.django import (
     FlatIndex,
     Float16VectorField,
     HnswIndex,
+    IvfIndex,
     JaccardDistance,
     L2Distance,
     MaxInnerProduct,
     SparseVectorField,
     VectorExtension,
     VectorField,
+    search_option,
 )
-from pgvecto_rs.types import BinaryVector
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.types import BinaryVector, IndexOption, SearchOption
 from tests import (
     BINARY_VECTORS,
     COSINE_DIS_OP,
@@ -63,6 +66,13 @@ class Item(models.Model):
                 threads=1,
                 opclasses=["vector_l2_ops"],
             ),
+            HnswIndex(
+                name="emb_idx_3",
+                fields=["embedding"],
+                opclasses=["vector_cos_ops"],
+                max_growing_segment_size=1000,
+                sealing_secs=10,
+            ),
         )
 
 
@@ -122,6 +132,16 @@ class Migration(migrations.Migration):
                 opclasses=["vector_l2_ops"],
             ),
         ),
+        migrations.AddIndex(
+            model_name="item",
+            index=HnswIndex(
+                name="emb_idx_3",
+                fields=["embedding"],
+                opclasses=["vector_cos_ops"],
+                max_growing_segment_size=1000,
+                sealing_secs=10,
+            ),
+        ),
     )
 
 
@@ -183,6 +203,28 @@ class SparseVectorForm(ModelForm):
         fields = ("sparse_embedding",)
 
 
+def test_index_options():
+    index = IvfIndex(
+        name="emb_idx",
+        fields=["embedding"],
+        nlist=100,
+        nsample=1000,
+        threads=2,
+        max_sealed_segment_size=10_000,
+        delete_threshold=0.5,
+    )
+    option = IndexOption.loads(index.get_with_params()[0])
+    assert option.index.nsample == 1000  # noqa: PLR2004
+    assert option.segment.max_sealed_segment_size == 10_000  # noqa: PLR2004
+    assert option.optimizing.delete_threshold == 0.5  # noqa: PLR2004
+    assert option.threads == 2  # noqa: PLR2004
+    _, _, kwargs = index.deconstruct()
+    assert kwargs["nsample"] == 1000  # noqa: PLR2004
+    assert "iterations" not in kwargs
+    with pytest.raises(OptionValueError):
+        HnswIndex(name="emb_idx", fields=["embedding"], sealing_secs=0)
+
+
 def test_l2_distance(session: CursorWrapper):
     distance = L2Distance("embedding", L2_DIS_OP)
     items = Item.objects.annotate(distance=distance).order_by(distance)
@@ -246,6 +288,22 @@ def test_filter(session: CursorWrapper):
     assert [v.id for v in items] == [3]
 
 
+def test_search_option(session: CursorWrapper):
+    with search_option(SearchOption(ef_search=64)):
+        session.execute("SHOW vectors.hnsw_ef_search")
+        assert session.fetchone()[0] == "64"
+        distance = L2Distance("embedding", L2_DIS_OP)
+        assert len(Item.objects.order_by(distance)[:2]) == 2  # noqa: PLR2004
+    session.execute("SHOW vectors.hnsw_ef_search")
+    assert session.fetchone()[0] != "64"
+    # nested in an atomic block, the settings are restored when the block raises
+    with transaction.atomic():
+        with pytest.raises(KeyError), search_option(SearchOption(ef_search=64)):
+            raise KeyError
+        session.execute("SHOW vectors.hnsw_ef_search")
+        assert session.fetchone()[0] != "64"
+
+
 def test_clean(session: CursorWrapper):
     session.execute("TRUNCATE django_app_item")
     item = Item(
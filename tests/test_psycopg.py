@@ -3,8 +3,9 @@ import psycopg
 import pytest
 from psycopg import Connection, sql
 
-from pgvecto_rs.psycopg import register_vector
-from pgvecto_rs.types import BinaryVector, Float16Vector
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.psycopg import register_vector, search_option, warmup
+from pgvecto_rs.types import BinaryVector, Float16Vector, SearchOption
 from tests import (
     BINARY_VECTORS,
     COSINE_DIS_OP,
@@ -191,6 +192,37 @@ def test_filter(session):
         assert dis < FILTER_VALUE
 
 
+def test_search_option(session: Connection):
+    create_items(session)
+    with search_option(session, SearchOption(ef_search=64, search_mode="basic")):
+        setting = session.execute("SHOW vectors.hnsw_ef_search")
+        cur = session.execute(
+            "SELECT id FROM tb_test_item ORDER BY embedding <-> %s LIMIT 2;",
+            (L2_DIS_OP,),
+        )
+        assert setting.fetchone()[0] == "64"
+        assert len(cur.fetchall()) == 2  # noqa: PLR2004
+    cur = session.execute("SHOW vectors.hnsw_ef_search")
+    assert cur.fetchone()[0] != "64"
+    # nested in a transaction, the settings are restored when the block raises
+    with session.transaction():
+        with pytest.raises(KeyError), search_option(
+            session, SearchOption(ef_search=64)
+        ):
+            raise KeyError
+        cur = session.execute("SHOW vectors.hnsw_ef_search")
+        assert cur.fetchone()[0] != "64"
+
+
+def test_warmup(session: Connection):
+    create_items(session)
+    assert warmup(session, "tb_test_item", queries=4, top_k=2) > 0
+    # schema-qualified names
+    assert warmup(session, "public.tb_test_item", queries=4, top_k=2) > 0
+    with pytest.raises(OptionValueError):
+        warmup(session, "tb_test_item", distance_op="<>")
+
+
 # =================================
 # Suffix functional tests
 # =================================
@@ -1,12 +1,46 @@
+import asyncio
 import time
 from typing import Callable, List
+from uuid import uuid4
 
 import numpy as np
 import pytest
 from sqlalchemy.exc import IntegrityError
 
-from pgvecto_rs.sdk import Filter, PGVectoRs, Record, filters
+from pgvecto_rs.errors import (
+    OptionValueError,
+    TypeNotFoundError,
+    VectorIndexUnusedWarning,
+)
+from pgvecto_rs.sdk import (
+    AsyncPGVectoRs,
+    Filter,
+    PGVectoRs,
+    Record,
+    SearchCache,
+    SearchResult,
+    filters,
+)
+from pgvecto_rs.sdk.client import (
+    IndexStats,
+    _is_missing_schema,
+    _with_threads,
+    collection_table,
+)
+from pgvecto_rs.sdk.filters import Contains, Eq, Exists, In, Range
+from pgvecto_rs.sdk.metrics import exact_neighbors, recall
+from pgvecto_rs.sdk.monitor import RecallMonitor
 from pgvecto_rs.sdk.record import Column, Unique
+from pgvecto_rs.sdk.tuner import tune_index
+from pgvecto_rs.types import (
+    Flat,
+    Hnsw,
+    IndexOption,
+    Optimizing,
+    SearchOption,
+    SparseVector,
+    Vector,
+)
 from tests import (
     COSINE_DIS_OP,
     L2_DIS_OP,
@@ -87,6 +121,538 @@ def test_search_order_and_limit(
         assert np.allclose(expect, dis, atol=1e-10)
 
 
+def test_search_option(client: PGVectoRs):
+    expect = client.search(L2_DIS_OP, top_k=4)
+    tuned = client.search(
+        L2_DIS_OP, top_k=4, search_option=SearchOption(ef_search=128, nprobe=4)
+    )
+    assert [rec.id for rec, _ in tuned] == [rec.id for rec, _ in expect]
+
+
+@pytest.mark.parametrize("dis_op", ["<->", "<#>", "<=>"])
+def test_search_batch(client: PGVectoRs, dis_op: str):
+    queries = [L2_DIS_OP, MAX_INNER_PROD_OP, COSINE_DIS_OP]
+    batch = client.search_batch(queries, dis_op, top_k=4, filter=filter_src1)
+    assert len(batch) == len(queries)
+    for query, results in zip(queries, batch):
+        expect = client.search(query, dis_op, top_k=4, filter=filter_src1)
+        assert [rec.id for rec, _ in results] == [rec.id for rec, _ in expect]
+        assert np.allclose([d for _, d in results], [d for _, d in expect])
+    assert client.search_batch([]) == []
+
+
+def test_search_projection(client: PGVectoRs):
+    expect = client.search(L2_DIS_OP, top_k=4, filter=filter_src1)
+    texts = client.search(L2_DIS_OP, top_k=4, filter=filter_src1, include=["text"])
+    assert [(r.id, r.text) for r, _ in texts] == [(r.id, r.text) for r, _ in expect]
+    assert all(r.meta is None and r.embedding is None for r, _ in texts)
+    no_vectors = client.search_batch([L2_DIS_OP], exclude=["embedding"])[0]
+    assert all(r.meta is not None and r.embedding is None for r, _ in no_vectors)
+    ids = client.search(L2_DIS_OP, top_k=4, filter=filter_src1, ids_only=True)
+    assert [r.id for r, _ in ids] == [r.id for r, _ in expect]
+    assert np.allclose([d for _, d in ids], [d for _, d in expect])
+    assert all(r.text is None for r, _ in ids)
+    with pytest.raises(OptionValueError):
+        client.search(L2_DIS_OP, include=["text"], exclude=["meta"])
+    with pytest.raises(OptionValueError):
+        client.search(L2_DIS_OP, include=["vector"])
+
+
+def test_search_result(client: PGVectoRs):
+    result = client.search(L2_DIS_OP, top_k=4, filter=filter_src1)
+    assert isinstance(result, SearchResult)
+    assert result.distances.dtype == np.float32
+    assert result.embeddings.shape == (len(result), 3)
+    expect = [l2_distance(L2_DIS_OP, e) for e in result.embeddings]
+    assert np.allclose(result.distances, expect)
+    for i, (rec, dis) in enumerate(result):
+        assert rec.id == result.ids[i]
+        assert rec.text == result.texts[i]
+        assert np.allclose(rec.embedding.to_numpy(), result.embeddings[i])
+        assert dis == result.distances[i]
+    assert result[1:].ids == result.ids[1:]
+    assert client.search(L2_DIS_OP, ids_only=True).embeddings is None
+
+
+def test_search_cache_eviction():
+    def result(n: int) -> SearchResult:
+        return SearchResult(
+            [uuid4() for _ in range(n)],
+            np.zeros(n, dtype=np.float32),
+            embeddings=np.zeros((n, 256), dtype=np.float32),
+        )
+
+    cache = SearchCache(max_bytes=3 * 256 * 4)
+    keys = [SearchCache.key(v, "<->", 1) for v in VECTORS[:3]]
+    assert keys[0] == SearchCache.key(np.array(VECTORS[0]), "<->", 1)
+    # vectors read from the database and sparse vectors are keyed by their values
+    assert keys[0] == SearchCache.key(Vector(VECTORS[0]), "<->", 1)
+    sparse = SparseVector({0: 1.0}, 3)
+    assert SearchCache.key(sparse, "<->", 1) == SearchCache.key([1, 0, 0], "<->", 1)
+    cache.put(keys[0], result(2), cache.generation)
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[1], result(2), cache.generation)
+    # the least recently used entry is evicted
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    generation = cache.generation
+    cache.clear()
+    cache.put(keys[2], result(1), generation)
+    assert cache.get(keys[2]) is None
+    # clearing a namespace keeps the entries of the others
+    kept = SearchCache.key(VECTORS[0], "<->", 1, namespace="kept")
+    cleared = SearchCache.key(VECTORS[0], "<->", 1, namespace="cleared")
+    assert kept != cleared
+    cache.put(kept, result(1), cache.generation)
+    cache.put(cleared, result(1), cache.generation)
+    cache.clear("cleared")
+    assert cache.stats().entries == 1
+    assert cache.get(kept) is not None
+    assert cache.get(cleared) is None
+    cache.clear()
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (3, 3, 0)
+    assert stats.hit_rate == stats.hits / (stats.hits + stats.misses)
+
+
+def test_search_cache(client: PGVectoRs):
+    cache = SearchCache(ttl=60)
+    cached_client = PGVectoRs(
+        client._engine, collection_name="empty", dimension=3, cache=cache
+    )
+    first = cached_client.search(L2_DIS_OP, top_k=2, filter=filter_src1)
+    assert cached_client.search(L2_DIS_OP, top_k=2, filter=filter_src1) is first
+    assert cached_client.search(L2_DIS_OP, top_k=3, filter=filter_src1) is not first
+    assert cache.stats().hits == 1
+    # clients of other collections sharing the cache don't hit its entries
+    other = PGVectoRs(
+        client._engine, collection_name="cache_other", dimension=3, cache=cache
+    )
+    other.insert([Record.from_text("other", VECTORS[0], {"src": "src1"})])
+    assert other.search(L2_DIS_OP, top_k=2, filter=filter_src1) is not first
+    assert cached_client.search(L2_DIS_OP, top_k=2, filter=filter_src1) is first
+    assert cache.stats().hits == 2  # noqa: PLR2004
+    # writes through a client clear the entries of its collection only
+    other.delete_all()
+    assert cached_client.search(L2_DIS_OP, top_k=2, filter=filter_src1) is first
+    cached_client.delete_by_ids([])
+    assert cached_client.search(L2_DIS_OP, top_k=2, filter=filter_src1) is not first
+    assert cache.stats().hits == 3  # noqa: PLR2004
+    other.drop()
+    # the embeddings of search results are Vector objects, which hit too
+    target = first.record(0).embedding
+    hits = cache.stats().hits
+    vector_first = cached_client.search(target, top_k=2)
+    assert cached_client.search(target, top_k=2) is vector_first
+    assert cache.stats().hits == hits + 1
+
+
+def test_filter_cache_key():
+    built = Eq("src", "src1") & In("lang", ["en", "fr"]) | Range("n", ge=1, lt=3)
+    again = Eq("src", "src1") & In("lang", ["fr", "en"]) | Range("n", ge=1, lt=3)
+    assert built.cache_key == again.cache_key
+    assert built == again
+    assert Eq("src", "src1") != Eq("src", "src2")
+    assert Range("n", ge=1) != Range("n", gt=1)
+
+
+def test_filter_dsl(client: PGVectoRs):
+    assert client.create_meta_index() == ["collection_empty_meta_gin"]
+    src1 = client.search(L2_DIS_OP, top_k=99, filter=filter_src1)
+    eq = client.search(L2_DIS_OP, top_k=99, filter=Eq("src", "src1"))
+    assert eq.ids == src1.ids
+    both = client.search(L2_DIS_OP, top_k=99, filter=In("src", ["src1", "src2"]))
+    assert len(both) == len(MockTexts) * 2
+    assert len(client.search(L2_DIS_OP, top_k=99, filter=Exists("src"))) == len(both)
+    assert len(client.search(L2_DIS_OP, top_k=99, filter=Exists("lang"))) == 0
+
+    range_client = PGVectoRs(
+        db_url=URL, collection_name="filter_dsl", dimension=3, recreate=True
+    )
+    range_client.insert(
+        [
+            Record.from_text(f"text{i}", v, {"n": i, "tags": [f"tag{i % 2}"]})
+            for i, v in enumerate(VECTORS)
+        ]
+    )
+    assert range_client.create_meta_index(keys=["n"]) == [
+        "collection_filter_dsl_meta_n"
+    ]
+    in_range = range_client.search(L2_DIS_OP, top_k=99, filter=Range("n", ge=1, lt=3))
+    assert sorted(rec.meta["n"] for rec, _ in in_range) == [1, 2]
+    tagged = Contains("tags", "tag0") & Range("n", gt=0)
+    assert all(
+        rec.meta["n"] % 2 == 0 and rec.meta["n"] > 0
+        for rec, _ in range_client.search(L2_DIS_OP, top_k=99, filter=tagged)
+    )
+    range_client.drop()
+
+
+def test_scan(client: PGVectoRs):
+    expect = sorted(client.search(L2_DIS_OP, top_k=99).ids)
+    batches = list(client.scan(batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 2]
+    assert [id for batch in batches for id in batch.ids] == expect
+    assert batches[0].embeddings.shape == (4, 3)
+
+    batches = list(client.scan(batch_size=2, filter=filter_src1, columns=["text"]))
+    assert all(batch.embeddings is None for batch in batches)
+    assert sorted(rec.text for batch in batches for rec in batch) == sorted(MockTexts)
+
+    parallel = list(client.scan_parallel(workers=3, batch_size=1))
+    assert sorted(id for batch in parallel for id in batch.ids) == expect
+
+
+def test_fetch(client: PGVectoRs):
+    hits = [rec for rec, _ in client.search(L2_DIS_OP, top_k=3)]
+    ids = [hits[2].id, uuid4(), hits[0].id]
+    records = client.fetch(ids)
+    assert [rec.id for rec in records] == [hits[2].id, hits[0].id]
+    assert records[0].text == hits[2].text
+    assert np.allclose(records[0].embedding.to_numpy(), hits[2].embedding.to_numpy())
+
+
+def test_delete_chunked(client: PGVectoRs):
+    chunked = PGVectoRs(
+        client._engine, collection_name="delete_chunked", dimension=3, recreate=True
+    )
+    ids = chunked.insert_array(
+        np.array(VECTORS[:3] * 4), [f"text{i}" for i in range(12)]
+    )
+    done: List[int] = []
+    deleted, kept = ids[:5], ids[-1]
+    assert chunked.delete_by_ids([*deleted, uuid4()], chunk_size=2) == len(deleted)
+    assert chunked.delete(filter_src1, chunk_size=2) == 0
+    rest = len(ids) - len(deleted) - 1
+    assert (
+        chunked.delete(lambda r: r.id != kept, chunk_size=3, progress=done.append)
+        == rest
+    )
+    assert done == [3, 6, 6]
+    assert chunked.row_count(estimate=False) == 1
+    chunked.delete_all(truncate=True)
+    assert chunked.row_count(estimate=False) == 0
+    chunked.drop()
+
+
+def test_insert_array(client: PGVectoRs):
+    array_client = PGVectoRs(
+        db_url=URL, collection_name="insert_array", dimension=3, recreate=True
+    )
+    embeddings = np.array(VECTORS, dtype=np.float32)
+    texts = [f"text{i}" for i in range(len(VECTORS))]
+    ids = array_client.insert_array(embeddings, texts, batch_size=2)
+    assert array_client.row_count(estimate=False) == len(VECTORS)
+    rec, dis = array_client.search(VECTORS[0], top_k=1)[0]
+    assert rec.id == ids[0]
+    assert rec.text == texts[0]
+    assert np.allclose(dis, 0, atol=1e-10)
+    array_client.drop()
+
+
+@pytest.mark.parametrize(
+    ("vector_type", "dis_op"),
+    [("vecf16", "<->"), ("bvector", "<~>"), ("svector", "<#>")],
+)
+def test_vector_type(client: PGVectoRs, vector_type: str, dis_op: str):
+    compact = PGVectoRs(
+        client._engine,
+        collection_name=f"compact_{vector_type}",
+        dimension=3,
+        recreate=True,
+        vector_type=vector_type,
+    )
+    records = [Record.from_text(t, v) for t, v in MockTexts.items()]
+    compact.insert(records)
+    # float32 queries are converted to the type of the column
+    result = compact.search(np.array(VECTORS[0], dtype=np.float32), dis_op, top_k=3)
+    assert len(result) == len(records)
+    assert result.embeddings.shape == (3, 3)
+    if vector_type == "bvector":
+        assert compact.storage().saved > 0
+    compact.drop()
+
+    with pytest.raises(OptionValueError):
+        collection_table("compact", 3, vector_type="half")
+
+
+def test_vector_index(client: PGVectoRs):
+    indexed = PGVectoRs(
+        client._engine, collection_name="vector_index", dimension=3, recreate=True
+    )
+    indexed.insert_array(np.array(VECTORS[:3] * 4), [f"text{i}" for i in range(12)])
+    name = indexed.create_index(IndexOption(Hnsw(), threads=1), "<=>")
+    assert name == "collection_vector_index_vector_cos_ops"
+    assert indexed.create_index(IndexOption(Hnsw()), "<=>") == name
+
+    polls: List[IndexStats] = []
+    stats = indexed.wait_for_index(
+        name, timeout=60, poll_interval=0.1, progress=polls.append
+    )
+    assert not stats.indexing
+    assert polls[-1] == stats
+    assert [s.name for s in indexed.index_stats()] == [name]
+    assert indexed.search(VECTORS[0], "<=>", top_k=3).ids
+
+    (info,) = indexed.list_indexes()
+    assert (info.name, info.opclass) == (name, "vector_cos_ops")
+    assert info.option.threads == 1
+    assert isinstance(info.option.index, Hnsw)
+
+    # indexes created without options have the default ones
+    with indexed._engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"CREATE INDEX vector_index_plain ON {indexed._table.name} "
+            "USING vectors (embedding vector_l2_ops)"
+        )
+    plain = {i.name: i for i in indexed.list_indexes()}["vector_index_plain"]
+    assert plain.opclass == "vector_l2_ops"
+    assert isinstance(plain.option.index, Hnsw)
+    assert plain.option.threads is None
+    indexed.drop_index("vector_index_plain", concurrently=False)
+
+    result = indexed.search(VECTORS[0], "<=>", top_k=3, explain=True)
+    assert result.plan.index == name
+    assert result.plan.execution_ms > 0
+    assert len(result) == len(indexed.search(VECTORS[0], "<=>", top_k=3))
+    # no index serves the L2 distance
+    with pytest.warns(VectorIndexUnusedWarning):
+        result = indexed.search(VECTORS[0], "<->", top_k=3, explain=True)
+    assert not result.plan.uses_index
+
+    indexed.reindex(name)
+    indexed.drop_index(name)
+    indexed.drop_index(name)
+    assert indexed.index_stats() == []
+    # names are quoted
+    quoted = indexed.create_index(Flat(), concurrently=False, name='vector "idx"')
+    indexed.reindex(quoted, concurrently=False)
+    assert [s.name for s in indexed.index_stats()] == [quoted]
+    indexed.drop_index(quoted, concurrently=False)
+    assert indexed.index_stats() == []
+    indexed.drop()
+
+
+def test_bulk_load(client: PGVectoRs):
+    loaded = PGVectoRs(
+        client._engine, collection_name="bulk_load", dimension=3, recreate=True
+    )
+    name = loaded.create_index(
+        IndexOption(Hnsw(), optimizing=Optimizing(threads=1, sealing_secs=30))
+    )
+    with loaded.bulk_load(threads=2, wait=True) as loader:
+        assert loaded.index_stats() == []
+        loader.insert_array(np.array(VECTORS[:3] * 4), [f"text{i}" for i in range(12)])
+    assert [s.name for s in loaded.index_stats()] == [name]
+    assert loaded.row_count(estimate=False) == len(VECTORS[:3] * 4)
+
+    # the indexes are created again when the load fails
+    with pytest.raises(IntegrityError), loaded.bulk_load():
+        loaded.insert_array(np.array(VECTORS[:2]), ["dup", "dup"], ids=[uuid4()] * 2)
+    assert [s.name for s in loaded.index_stats()] == [name]
+
+    # an index created without options gets them for the threads
+    loaded.drop_index(name, concurrently=False)
+    with loaded._engine.begin() as conn:
+        conn.exec_driver_sql(
+            f"CREATE INDEX bulk_load_plain ON {loaded._table.name} "
+            "USING vectors (embedding vector_l2_ops)"
+        )
+    with loaded.bulk_load(threads=2, wait=True) as loader:
+        assert loaded.index_stats() == []
+        loader.insert_array(np.array(VECTORS[:3]), ["a", "b", "c"])
+    assert [s.name for s in loaded.index_stats()] == ["bulk_load_plain"]
+    loaded.drop()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        IndexOption(Hnsw()),
+        IndexOption(Hnsw(m=8), threads=2),
+        IndexOption(Hnsw(), optimizing=Optimizing(sealing_secs=30)),
+    ],
+)
+def test_with_threads(option: IndexOption):
+    options = option.dumps().replace("'", "''")
+    indexdef = f"CREATE INDEX idx ON t USING vectors (e vector_l2_ops) WITH (options='{options}')"
+    loaded = IndexOption.loads(_with_threads(indexdef, 4))
+    assert loaded.threads == 4  # noqa: PLR2004
+    assert loaded.index.dump() == option.index.dump()
+    sealing_secs = option.optimizing and option.optimizing.sealing_secs
+    assert loaded.optimizing.sealing_secs == sealing_secs
+
+
+@pytest.mark.parametrize("predicate", ["", " WHERE (id IS NOT NULL)"])
+def test_with_threads_without_options(predicate: str):
+    indexdef = f"CREATE INDEX idx ON t USING vectors (e vector_l2_ops){predicate}"
+    indexdef = _with_threads(indexdef, 4)
+    assert indexdef.endswith(predicate)
+    loaded = IndexOption.loads(indexdef)
+    assert loaded.threads == 4  # noqa: PLR2004
+    assert isinstance(loaded.index, Hnsw)
+
+
+def test_warmup(client: PGVectoRs):
+    report = client.warmup(queries=4, top_k=2)
+    assert report.seconds > 0
+    assert 0 < report.queries <= 4  # noqa: PLR2004
+    assert client.warmup(queries=0).queries == 0
+
+
+@pytest.mark.parametrize("dis_op", ["<->", "<#>", "<=>"])
+def test_exact_neighbors(dis_op: str):
+    data = np.array(VECTORS[:3], dtype=np.float32)
+    dist_func = {
+        "<->": lambda a, b: l2_distance(a, b) ** 2,
+        "<#>": max_inner_product,
+        "<=>": cosine_distance,
+    }[dis_op]
+    expect = [
+        sorted(range(len(data)), key=lambda i: dist_func(data[i], query))
+        for query in data
+    ]
+    assert exact_neighbors(data, data, dis_op, top_k=3).tolist() == expect
+    assert recall([1, 2], [2, 3]) == 1 / 2
+
+
+def test_tune_index(client: PGVectoRs):
+    candidates = [IndexOption(Flat()), IndexOption(Hnsw(m=8, ef_construction=50))]
+    report = tune_index(
+        client, target_recall=0.5, candidates=candidates, sample_rows=6, queries=2
+    )
+    assert len(report.trials) == len(candidates)
+    assert report.best is not None
+    assert report.best.recall >= 0.5  # noqa: PLR2004
+    assert all(trial.p50 <= trial.p99 for trial in report.trials)
+
+
+def test_recall_monitor(client: PGVectoRs):
+    monitor = RecallMonitor(client, "<->", top_k=3, sample_rate=1.0, min_interval=0)
+    samples = monitor.check(VECTORS[:3])
+    assert [s.recall for s in samples] == [1.0] * len(samples)
+    assert all(s.distance_error == pytest.approx(0, abs=1e-6) for s in samples)
+
+    result = client.search(VECTORS[0], "<->", top_k=1)
+    sample = monitor.observe(VECTORS[0], result)
+    assert sample is not None
+    assert sample.recall == 1 / 3
+    summary = monitor.summary()
+    assert summary.samples == len(samples) + 1
+    assert summary.min_recall == sample.recall
+    assert monitor.summary(since=time.time() + 1).samples == 0
+
+
+def test_recall_monitor_throttle():
+    unused = PGVectoRs(URL, collection_name="monitor", dimension=3, assume_schema=True)
+    never = RecallMonitor(unused, sample_rate=0.0)
+    assert never.observe(VECTORS[0], None) is None
+    throttled = RecallMonitor(unused, sample_rate=1.0, min_interval=60)
+    assert throttled._due()
+    assert not throttled._due()
+    assert throttled.history == []
+    with pytest.raises(OptionValueError):
+        RecallMonitor(unused, sample_rate=2)
+
+
+def test_collection_table_cache():
+    unique = [Unique(columns=[Column.TEXT, Column.META])]
+    table = collection_table("cached", 3, unique)
+    assert table is collection_table("cached", 3, unique)
+    assert table is not collection_table("cached", 4, unique)
+    assert table is not collection_table("cached", 3)
+    # each collection is kept out of any shared MetaData
+    assert list(table.metadata.tables) == ["collection_cached"]
+
+
+def test_assume_schema(client: PGVectoRs):
+    # the engine of the module client is shared, the missing table is created
+    # by the first statement
+    lazy_client = PGVectoRs(
+        client._engine, collection_name="assume_schema", dimension=3, recreate=True
+    )
+    lazy_client.drop()
+    lazy_client = PGVectoRs(
+        client._engine, collection_name="assume_schema", dimension=3, assume_schema=True
+    )
+    assert lazy_client._engine is client._engine
+    records = [Record.from_text(t, v) for t, v in MockTexts.items()]
+    lazy_client.insert(records)
+    assert lazy_client.row_count(estimate=False) == len(records)
+    lazy_client.drop()
+
+    # concurrent first calls create the schema once
+    async def run():
+        async_client = AsyncPGVectoRs(URL, collection_name="assume_schema", dimension=3)
+        await asyncio.gather(*[async_client.insert(records) for _ in range(4)])
+        assert await async_client.row_count(estimate=False) == 4 * len(records)
+        await async_client.drop()
+        await async_client.close()
+
+    asyncio.run(run())
+    # the types missing from the database are a missing schema too
+    assert _is_missing_schema(TypeNotFoundError("vector"))
+
+
+@pytest.mark.parametrize("driver", ["psycopg", "asyncpg"])
+def test_async_client(client: PGVectoRs, driver: str):
+    async def run():
+        async_client = await AsyncPGVectoRs.create(
+            db_url=URL.replace("psycopg", driver),
+            collection_name=f"async_{driver}",
+            dimension=3,
+            recreate=True,
+        )
+        records = [
+            Record.from_text(t, v, {"src": "src1"}) for t, v in MockTexts.items()
+        ]
+        await async_client.insert(records)
+        assert await async_client.row_count(estimate=False) == len(records)
+
+        queries = [L2_DIS_OP, MAX_INNER_PROD_OP, COSINE_DIS_OP]
+        # concurrent searches check out their own connections
+        results = await asyncio.gather(
+            *[async_client.search(q, top_k=2) for q in queries]
+        )
+        batch = await async_client.search_batch(queries, top_k=2)
+        for query, result, batched in zip(queries, results, batch):
+            expect = client.search(query, top_k=2, filter=filter_src1)
+            assert [rec.text for rec, _ in result] == [rec.text for rec, _ in expect]
+            assert [rec.id for rec, _ in batched] == [rec.id for rec, _ in result]
+
+        await async_client.delete_by_ids([records[0].id])
+        assert await async_client.row_count(estimate=False) == len(records) - 1
+        await async_client.drop()
+        await async_client.close()
+
+    asyncio.run(run())
+
+
+def test_upsert(client: PGVectoRs):
+    upsert_client = PGVectoRs(
+        db_url=URL,
+        collection_name="upsert",
+        dimension=3,
+        recreate=True,
+        constraints=[Unique(columns=[Column.TEXT])],
+    )
+    records = [Record.from_text(t, v, {"src": "src1"}) for t, v in MockTexts.items()]
+    assert upsert_client.upsert(records, batch_size=2) == len(records)
+    # unchanged rows are skipped
+    assert upsert_client.upsert(records, skip_unchanged=True) == 0
+
+    # a conflict on the unique text updates the embedding of the existing row
+    text1, _ = next(iter(MockTexts.items()))
+    updated = Record.from_text(text1, VECTORS[3], {"src": "src2"})
+    assert upsert_client.upsert([updated], on=Unique(columns=[Column.TEXT])) == 1
+    assert upsert_client.row_count(estimate=False) == len(records)
+    rec, dis = upsert_client.search(VECTORS[3], top_k=1)[0]
+    assert rec.id == records[0].id
+    assert rec.meta == {"src": "src2"}
+    assert np.allclose(dis, 0, atol=1e-10)
+    upsert_client.drop()
+
+
 def test_unique_text_table(
     client: PGVectoRs,
 ):
@@ -188,6 +754,23 @@ def test_count_table(
     rows = count_client.row_count(estimate=False, filter=filter_src2)
     assert rows == 0
 
+    # the planner estimate of a filtered count, from the statistics of the
+    # table, and a sample of all the pages
+    with count_client._engine.begin() as conn:
+        conn.exec_driver_sql(f"ANALYZE {count_client._table.name}")
+    unfiltered = count_client.row_count(estimate=True)
+    selective = count_client.row_count(estimate=True, filter=filter_src2)
+    assert selective < unfiltered
+    estimate = count_client.row_count(estimate=True, filter=filter_src1)
+    assert abs(estimate - COUNT) <= COUNT * 0.1
+    assert count_client.row_count(filter=filter_src1, sample=100) == COUNT
+    with pytest.raises(OptionValueError):
+        count_client.row_count(estimate=False, sample=10)
+
+    stats = count_client.stats()
+    assert stats.table_bytes > 0
+    assert count_client.stats() is stats
+
     for _ in range(90):
         estimate_rows = count_client.row_count(estimate=True)
         if estimate_rows == COUNT:
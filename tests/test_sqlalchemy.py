@@ -1,10 +1,34 @@
+import io
+
 import numpy as np
 import pytest
-from sqlalchemy import Index, Integer, create_engine, delete, insert, select, text
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    create_engine,
+    delete,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import StatementError
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
-
-from pgvecto_rs.sqlalchemy import BVECTOR, SVECTOR, VECF16, VECTOR
+from sqlalchemy.schema import CreateIndex
+
+from pgvecto_rs.sqlalchemy import (
+    BVECTOR,
+    SVECTOR,
+    VECF16,
+    VECTOR,
+    VectorIndex,
+    bulk_insert,
+    search_option,
+)
+from pgvecto_rs.types import Hnsw, IndexOption, Ivf, SearchOption
 from tests import (
     BINARY_VECTORS,
     COSINE_DIS_OP,
@@ -102,6 +126,66 @@ def test_create_index(session: Session, index_name: str, index_option: str):
     session.commit()
 
 
+def test_vector_index_ddl():
+    table = Table("tb_test_ddl", MetaData(), Column("embedding", VECF16(3)))
+    index = VectorIndex(
+        "emb_idx_ddl",
+        table.c.embedding,
+        IndexOption(index=Ivf(nlist=4), threads=1),
+        distance_op="<=>",
+        concurrently=True,
+    )
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl.startswith("CREATE INDEX CONCURRENTLY emb_idx_ddl ON tb_test_ddl")
+    assert "USING vectors (embedding vecf16_cos_ops)" in ddl
+    assert "nlist = 4" in ddl
+
+
+def test_alembic_vector_index_ops():
+    pytest.importorskip("alembic")
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    import pgvecto_rs.alembic  # noqa: F401
+
+    buf = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buf}
+    )
+    op = Operations(context)
+    op.create_vector_index(
+        "emb_idx_op", "tb_op", "embedding", Hnsw(m=8), concurrently=True
+    )
+    op.drop_vector_index("emb_idx_op", "tb_op", concurrently=True)
+    op.create_vector_index(
+        "emb_idx_op", "tb_op", "embedding", Ivf(), "vector_cos_ops", schema="sc"
+    )
+    op.drop_vector_index("emb_idx_op", "tb_op", schema="sc")
+
+    statements = [s.strip() for s in buf.getvalue().split(";\n") if s.strip()]
+    assert statements[0] == "COMMIT"
+    assert statements[1].startswith(
+        "CREATE INDEX CONCURRENTLY emb_idx_op ON tb_op "
+        "USING vectors (embedding vector_l2_ops) WITH (options = $$"
+    )
+    assert "m = 8" in statements[1]
+    assert statements[2:5] == ["BEGIN", "COMMIT", "DROP INDEX CONCURRENTLY emb_idx_op"]
+    assert statements[6].startswith(
+        "CREATE INDEX emb_idx_op ON sc.tb_op USING vectors (embedding vector_cos_ops)"
+    )
+    assert "[indexing.ivf]" in statements[6]
+    assert statements[7] == "DROP INDEX sc.emb_idx_op"
+
+
+def test_create_vector_index_concurrently(session: Session):
+    index = VectorIndex(
+        "emb_idx_concurrently", Document.embedding, Hnsw(m=8), concurrently=True
+    )
+    with session.bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        index.create(conn)
+        index.drop(conn)
+
+
 @pytest.mark.parametrize(("i", "e"), enumerate(INVALID_VECTORS))
 def test_invalid_insert(session: Session, i: int, e: np.array):
     try:
@@ -203,6 +287,36 @@ def test_filter(session):
         assert dis < FILTER_VALUE
 
 
+def test_bulk_insert(session: Session):
+    ids = [len(VECTORS) + i for i in range(len(VECTORS))]
+    count = bulk_insert(
+        session, Document, np.array(VECTORS, dtype=np.float32), columns={"id": ids}
+    )
+    session.commit()
+    assert count == len(VECTORS)
+    for row in session.scalars(select(Document).where(Document.id.in_(ids))):
+        expect = VECTORS[row.id - len(VECTORS)]
+        assert np.allclose(row.embedding.to_numpy(), expect, atol=1e-10)
+    session.execute(delete(Document).where(Document.id.in_(ids)))
+    session.commit()
+
+
+def test_search_option(session: Session):
+    show = text("SHOW vectors.hnsw_ef_search")
+    default = session.scalar(show)
+    with search_option(session, SearchOption(ef_search=64)):
+        assert session.scalar(show) == "64"
+        session.execute(
+            select(Document.id).order_by(Document.embedding.l2_distance(L2_DIS_OP))
+        )
+    assert session.scalar(show) == default
+    # the settings are restored when the block raises
+    with pytest.raises(KeyError), search_option(session, SearchOption(ef_search=64)):
+        raise KeyError
+    assert session.scalar(show) == default
+    session.rollback()
+
+
 # =================================
 # Suffix functional tests
 # =================================
@@ -1,10 +1,21 @@
 # TODO: remove after Python < 3.9 is no longer used
 from __future__ import annotations
 
+from typing import Callable
+
 import pytest
 
-from pgvecto_rs.types import IndexOption, SparseVector, Vector
-from tests import EQUAL_SPARSE_VECTORS, EQUAL_VECTORS, INDEX_OPTION_DUMPS
+from pgvecto_rs.errors import OptionValueError
+from pgvecto_rs.types import IndexOption, SearchOption, SparseVector, Vector
+from tests import (
+    EQUAL_SPARSE_VECTORS,
+    EQUAL_VECTORS,
+    INDEX_OPTION_DEFINITIONS,
+    INDEX_OPTION_DUMPS,
+    INVALID_INDEX_OPTIONS,
+    INVALID_SEARCH_OPTIONS,
+    SEARCH_OPTION_DUMPS,
+)
 
 
 def test_vector_equal():
@@ -29,3 +40,41 @@ def test_sparse_equal():
 @pytest.mark.parametrize(("inp", "out"), INDEX_OPTION_DUMPS)
 def test_index_option_dump(inp: IndexOption, out: str):
     assert inp.dumps() == out
+
+
+@pytest.mark.parametrize(("inp", "out"), INDEX_OPTION_DUMPS)
+def test_index_option_loads(inp: IndexOption, out: str):
+    assert IndexOption.loads(out).dumps() == inp.dumps()
+
+
+@pytest.mark.parametrize(("definition", "out"), INDEX_OPTION_DEFINITIONS)
+def test_index_option_loads_definition(definition: str, out: str):
+    assert IndexOption.loads(definition).dumps() == out
+
+
+@pytest.mark.parametrize("make", INVALID_INDEX_OPTIONS)
+def test_invalid_index_option(make: Callable[[], object]):
+    with pytest.raises(OptionValueError):
+        make()
+
+
+@pytest.mark.parametrize(("inp", "out"), SEARCH_OPTION_DUMPS)
+def test_search_option_dump(inp: SearchOption, out: dict):
+    assert inp.dump() == out
+
+
+def test_search_option_set_config_query():
+    assert SearchOption().set_config_query() is None
+    query, params = SearchOption(ef_search=64, nprobe=8).set_config_query()
+    column = "current_setting(%s, true), set_config(%s, %s, true)"
+    assert query == f"SELECT {column}, {column}"
+    assert params == [
+        *["vectors.hnsw_ef_search", "vectors.hnsw_ef_search", "64"],
+        *["vectors.ivf_nprobe", "vectors.ivf_nprobe", "8"],
+    ]
+
+
+@pytest.mark.parametrize("kwargs", INVALID_SEARCH_OPTIONS)
+def test_invalid_search_option(kwargs: dict):
+    with pytest.raises(OptionValueError):
+        SearchOption(**kwargs)